@@ -5,10 +5,11 @@ from app.api.v1.endpoints import (
     tours, departures, bookings, auth, admin, landlord, public, managers,
     external, broadcast, referrals, landlord_profile, support
 )
+from app.api.v1.routing import ORJSONRoute
 
 
 # Create main API router
-api_v1_router = APIRouter()
+api_v1_router = APIRouter(route_class=ORJSONRoute)
 
 # Include auth endpoints (public access)
 api_v1_router.include_router(
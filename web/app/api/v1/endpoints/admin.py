@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status, UploadFile, File, Form, Response
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status, UploadFile, File, Form, Response
 from pydantic import ValidationError
 
-from ....deps import SessionDep
+from ....deps import SessionDep, WritableSessionDep
 from ....security import role_required
 from ....services.admin_service import AdminService
 from ....core.exceptions import NotFoundError, ConflictError
-from ....storage import upload_qr_template, presigned
+from ....storage import upload_qr_template_async, presigned, fget_object
 from ..schemas.admin_schemas import (
     MaxCommissionBody,
     MetricsOut,
@@ -20,8 +20,10 @@ from ..schemas.admin_schemas import (
     UserUpdate,
     QrTemplateOut,
 )
+from ..routing import ORJSONRoute
 
 router = APIRouter(
+    route_class=ORJSONRoute,
     prefix="/admin",
     tags=["admin"],
     dependencies=[Depends(role_required("admin"))],
@@ -31,7 +33,7 @@ router = APIRouter(
 # Tour Commission Management
 @router.patch("/tours/{tour_id}/max-commission", response_model=MaxCommissionBody)
 async def set_max_commission(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     tour_id: int = Path(..., gt=0),
     body: MaxCommissionBody | None = None,
 ):
@@ -58,7 +60,7 @@ async def metrics(sess: SessionDep):
 
 # API Key Management
 @router.post("/api-keys", response_model=ApiKeyOut, status_code=status.HTTP_201_CREATED)
-async def create_api_key(payload: ApiKeyCreate, sess: SessionDep):
+async def create_api_key(payload: ApiKeyCreate, sess: WritableSessionDep):
     """Create a new API key for an agency."""
     service = AdminService(sess)
     try:
@@ -69,7 +71,11 @@ async def create_api_key(payload: ApiKeyCreate, sess: SessionDep):
 
 
 @router.get("/api-keys", response_model=list[ApiKeyOut])
-async def list_api_keys(sess: SessionDep, limit: int = 100, offset: int = 0):
+async def list_api_keys(
+    sess: SessionDep,
+    limit: int = Query(100, gt=0, le=500),
+    offset: int = Query(0, ge=0),
+):
     """List all API keys."""
     service = AdminService(sess)
     api_keys = await service.list_api_keys(limit, offset)
@@ -77,7 +83,7 @@ async def list_api_keys(sess: SessionDep, limit: int = 100, offset: int = 0):
 
 
 @router.delete("/api-keys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_api_key(sess: SessionDep, key_id: int):
+async def delete_api_key(sess: WritableSessionDep, key_id: int):
     """Delete an API key."""
     service = AdminService(sess)
     try:
@@ -89,7 +95,7 @@ async def delete_api_key(sess: SessionDep, key_id: int):
 # QR Template Management
 @router.post("/qr-template", response_model=QrTemplateOut)
 async def upload_qr_template_settings(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     qr_template: UploadFile = File(None),
     qr_position_x: int = Form(..., gt=0),
     qr_position_y: int = Form(..., gt=0),
@@ -108,7 +114,7 @@ async def upload_qr_template_settings(
                     detail="Only PNG and JPEG images are supported"
                 )
             
-            template_key = upload_qr_template(qr_template)
+            template_key = await upload_qr_template_async(qr_template)
         else:
             # Get existing template key if available
             settings = await service.get_qr_template_settings()
@@ -158,7 +164,7 @@ async def get_settings(sess: SessionDep):
 
 
 @router.post("/settings", response_model=dict)
-async def update_settings(sess: SessionDep, settings: dict):
+async def update_settings(sess: WritableSessionDep, settings: dict):
     """Update global settings."""
     service = AdminService(sess)
     return await service.update_global_settings(settings)
@@ -166,7 +172,7 @@ async def update_settings(sess: SessionDep, settings: dict):
 
 # User Management
 @router.post("/users", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-async def create_user(payload: UserCreate, sess: SessionDep):
+async def create_user(payload: UserCreate, sess: WritableSessionDep):
     """Create a new user."""
     service = AdminService(sess)
     try:
@@ -182,7 +188,11 @@ async def create_user(payload: UserCreate, sess: SessionDep):
 
 
 @router.get("/users", response_model=list[UserOut])
-async def list_users(sess: SessionDep, limit: int = 100, offset: int = 0):
+async def list_users(
+    sess: SessionDep,
+    limit: int = Query(100, gt=0, le=500),
+    offset: int = Query(0, ge=0),
+):
     """List all users."""
     service = AdminService(sess)
     users = await service.list_users(limit, offset)
@@ -190,7 +200,7 @@ async def list_users(sess: SessionDep, limit: int = 100, offset: int = 0):
 
 
 @router.patch("/users/{user_id}", response_model=UserOut)
-async def update_user(user_id: int, payload: UserUpdate, sess: SessionDep):
+async def update_user(user_id: int, payload: UserUpdate, sess: WritableSessionDep):
     """Update a user."""
     service = AdminService(sess)
     try:
@@ -207,7 +217,7 @@ async def update_user(user_id: int, payload: UserUpdate, sess: SessionDep):
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: int, sess: SessionDep):
+async def delete_user(user_id: int, sess: WritableSessionDep):
     """Delete a user."""
     service = AdminService(sess)
     try:
@@ -274,8 +284,6 @@ async def test_qr_pdf(sess: SessionDep):
         orig_qr_width = int(qr_template_settings.get('width', 200))
         orig_qr_height = int(qr_template_settings.get('height', 200))
 
-        from ....storage import client, BUCKET
-
         # Generate PDF
         buf = io.BytesIO()
         pdf = _canvas.Canvas(buf, pagesize=A4)
@@ -284,7 +292,7 @@ async def test_qr_pdf(sess: SessionDep):
         try:
             # Get template image directly from S3, save to temp file
             with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                client.fget_object(BUCKET, template_url, temp_file.name)
+                await fget_object(template_url, temp_file.name)
                 template_path = temp_file.name
 
             # Load the image from the temp file at full quality
@@ -8,7 +8,7 @@ from typing import Dict, Optional
 import logging
 from datetime import datetime
 import asyncio
-from sqlalchemy import select
+import urllib.parse
 
 from app.api.v1.schemas.auth_schemas import (
     LoginRequest, LoginResponse, RefreshTokenRequest, RefreshTokenResponse,
@@ -20,9 +20,12 @@ from app.services.auth_service import AuthService
 from app.security import current_user, decode_token, ACCESS_TOKEN_EXP_SECONDS, REFRESH_TOKEN_EXP_SECONDS
 from app.api.v1.utils import verify_telegram_webapp_data
 from app.models import User, ReferralEvent
+from app.roles import Role
+from app.infrastructure.repositories import UserRepository
+from app.api.v1.routing import ORJSONRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 # OAuth2 scheme for Swagger UI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
@@ -185,7 +188,6 @@ async def get_current_user(
     user=Depends(current_user)
 ):
     """Get current user info"""
-    from app.infrastructure.repositories import UserRepository
     
     user_repo = UserRepository(sess)
     user_obj = await user_repo.get_with_agency(int(user["sub"]))
@@ -238,7 +240,6 @@ async def telegram_webapp_init(
             except json.JSONDecodeError:
                 # If not valid JSON, it might be URL encoded
                 logger.debug("Failed to parse as JSON, trying URL decode")
-                import urllib.parse
                 try:
                     decoded = urllib.parse.unquote(user_json)
                     user_data = json.loads(decoded)
@@ -261,10 +262,6 @@ async def telegram_webapp_init(
     
     logger.info(f"Authenticating Telegram user: {user_data.get('id')} ({user_data.get('username', 'no username')})")
     
-    # Get or create user
-    from app.models import User
-    from app.roles import Role
-    
     # Get or create user
     user = await User.get_or_create(
         sess, 
@@ -450,34 +447,22 @@ async def telegram_auth(
         logger.error("Missing user ID in Telegram user data")
         raise HTTPException(status_code=400, detail="Missing user ID in Telegram user data")
     
-    from app.models import User
-    from app.roles import Role
     
-    # First check if user exists, to preserve their role
+    # Look the user up once; an existing user keeps their role (admin stays admin)
     tg_id = int(telegram_user.get("id"))
-    existing_user = None
+    existing_user = await UserRepository(sess).get_by_telegram_id(tg_id)
     
-    # Check for existing user first
-    stmt = select(User).where(User.tg_id == tg_id)
-    existing_user = await sess.scalar(stmt)
-    
-    # Determine role - preserve existing role or default to bot_user
-    role = None
     if existing_user:
-        # Preserve the existing role (admin stays admin)
-        role = existing_user.role
-        logger.info(f"User exists with role: {role}")
+        user = existing_user
+        logger.info(f"User exists with role: {user.role}")
     else:
         # New user gets bot_user role
-        role = Role.bot_user
         logger.info(f"New user, assigning role: {Role.bot_user}")
-    
-    # Get or create user with the correct role
-    user = await User.get_or_create(
-        sess, 
-        telegram_user,
-        role=role  # Use preserved role or bot_user for new users
-    )
+        user = await User.get_or_create(
+            sess, 
+            telegram_user,
+            role=Role.bot_user
+        )
     
     # Flush the session to ensure the user has an ID before authentication
     await sess.flush()
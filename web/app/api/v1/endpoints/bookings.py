@@ -1,22 +1,23 @@
 from typing import List, Optional
 from datetime import date
 from fastapi import APIRouter, Depends, Query, Request
-from fastapi.responses import StreamingResponse, JSONResponse
-import io
-import csv
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse
 import json
 
 from app.api.v1.schemas.booking_schemas import (
     BookingStatusUpdate, BookingOut, BookingExportOut, BookingMetrics,
     TouristBookingOut
 )
-from app.deps import SessionDep
+from app.deps import SessionDep, WritableSessionDep
 from app.security import current_user
-from app.services.booking_service import BookingService
+from app.services.booking_service import BookingService, EXPORT_CSV_FIELDS
+from app.infrastructure.database import AsyncSessionFactory
 from app.core import BaseError
+from app.api.v1.endpoints.utils import iter_csv
+from app.api.v1.routing import ORJSONRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 def get_agency_id(user: dict) -> int:
@@ -27,6 +28,18 @@ def get_agency_id(user: dict) -> int:
     return int(agency_id)
 
 
+async def _stream_export_rows(agency_id: int, from_date: Optional[date], to_date: Optional[date]):
+    """Stream the CSV export on its own session
+    
+    The request-scoped session is closed before a StreamingResponse body is
+    sent, so rows flowing DB -> CSV -> socket need a session of their own.
+    """
+    async with AsyncSessionFactory() as sess:
+        rows = BookingService(sess).iter_export_bookings(agency_id, from_date, to_date)
+        async for chunk in iter_csv(EXPORT_CSV_FIELDS, rows):
+            yield chunk
+
+
 @router.get("/", response_model=List[BookingExportOut])
 async def list_bookings(
     sess: SessionDep,
@@ -63,74 +76,25 @@ async def list_bookings(
                     content={"error": "Invalid to_date format. Use YYYY-MM-DD"}
                 )
         
-        # Get bookings data
-        bookings_data = await service.export_bookings(
-            agency_id=agency_id,
-            from_date=from_date_obj,
-            to_date=to_date_obj,
-            format=format or "json"
-        )
-        
-        # Add timezone offset from the tour's city
-        # We need to fetch this information separately to avoid modifying the service
-        from app.models import Purchase, Departure, Tour, City
-        from sqlalchemy import select
-        from sqlalchemy.orm import selectinload
-        
-        # Get all booking IDs from the exported data
-        booking_ids = [b["booking_id"] for b in bookings_data]
-        
-        if booking_ids:
-            # Fetch purchases with city timezone info
-            query = (
-                select(Purchase)
-                .options(
-                    selectinload(Purchase.departure)
-                    .selectinload(Departure.tour)
-                    .selectinload(Tour.city)
-                )
-                .where(Purchase.id.in_(booking_ids))
-            )
-            result = await sess.execute(query)
-            purchases_with_city = {p.id: p for p in result.scalars().all()}
-            
-            # Add timezone offset to each booking
-            for booking in bookings_data:
-                purchase = purchases_with_city.get(booking["booking_id"])
-                if purchase and purchase.departure and purchase.departure.tour and purchase.departure.tour.city:
-                    booking["timezone_offset_min"] = purchase.departure.tour.city.timezone_offset_min or 0
-                else:
-                    booking["timezone_offset_min"] = 0
-        
-        # Add missing fields required by schema
-        for booking in bookings_data:
-            if "commission_percent" not in booking:
-                booking["commission_percent"] = 0.0
-            if "commission_amount" not in booking:
-                booking["commission_amount"] = 0.0
-        
         # Return CSV if requested
         if format == "csv":
-            output = io.StringIO()
-            if bookings_data:
-                # Create CSV with all fields except categories (too complex for CSV)
-                fieldnames = [k for k in bookings_data[0].keys() if k != "categories"]
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for booking in bookings_data:
-                    row = {k: v for k, v in booking.items() if k != "categories"}
-                    writer.writerow(row)
-            
-            output.seek(0)
             return StreamingResponse(
-                io.BytesIO(output.getvalue().encode()),
+                _stream_export_rows(agency_id, from_date_obj, to_date_obj),
                 media_type="text/csv",
                 headers={"Content-Disposition": "attachment; filename=bookings.csv"}
             )
         
-        # Return JSON
-        return bookings_data
+        # Rows already carry timezone offset and commission defaults
+        bookings_data = await service.export_bookings(
+            agency_id=agency_id,
+            from_date=from_date_obj,
+            to_date=to_date_obj,
+            format=format or "json"
+        )
+        
+        # Rows are plain dicts of JSON-native values: serialise them straight
+        # with orjson; response_model is kept for the OpenAPI schema
+        return ORJSONResponse(content=bookings_data)
     except BaseError as e:
         return JSONResponse(
             status_code=e.status_code,
@@ -224,7 +188,7 @@ async def list_tourist_bookings(
 @router.patch("/tourist/{booking_id}/cancel")
 async def cancel_tourist_booking(
     booking_id: int,
-    sess: SessionDep,
+    sess: WritableSessionDep,
     request: Request,
     user=Depends(current_user),
 ):
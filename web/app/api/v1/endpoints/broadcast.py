@@ -4,14 +4,15 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException, Depends, Path, status, BackgroundTasks
 
-from ....deps import SessionDep
+from ....deps import SessionDep, WritableSessionDep
 from ....models import User
 from ....security import role_required, current_user
 from ....services.broadcast_service import BroadcastService
 from ....core.exceptions import NotFoundError, AuthorizationError
 from ..schemas.broadcast_schemas import BroadcastBody, BroadcastResponse, DepartureOut
+from ..routing import ORJSONRoute
 
-router = APIRouter(prefix="/departures", tags=["broadcast"])
+router = APIRouter(prefix="/departures", tags=["broadcast"], route_class=ORJSONRoute)
 
 
 async def _do_broadcast_task(
@@ -37,7 +38,7 @@ async def _do_broadcast_task(
 )
 async def broadcast(
     background_tasks: BackgroundTasks,
-    sess: SessionDep,
+    sess: WritableSessionDep,
     departure_id: int = Path(..., gt=0),
     payload: BroadcastBody | None = None,
     user=Depends(current_user),
@@ -8,9 +8,10 @@ from app.deps import SessionDep
 from app.security import current_user
 from app.services import DepartureService
 from app.core import BaseError
+from app.api.v1.routing import ORJSONRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 def get_agency_id(user: dict) -> int:
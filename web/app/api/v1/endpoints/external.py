@@ -5,8 +5,6 @@ from __future__ import annotations
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
 from fastapi.responses import StreamingResponse
-import csv
-from io import StringIO
 
 from ....deps import SessionDep
 from ....models import ApiKey
@@ -14,8 +12,10 @@ from ....security import require_api_key
 from ....services.external_service import ExternalService
 from ....core.exceptions import NotFoundError, ConflictError
 from ..schemas.external_schemas import CapacityBody, CapacityOut, BookingExportItem
+from .utils import iter_csv
+from ..routing import ORJSONRoute
 
-router = APIRouter(prefix="/external", tags=["external"])
+router = APIRouter(prefix="/external", tags=["external"], route_class=ORJSONRoute)
 
 
 def _get_agency_id_from_key(api_key_row: ApiKey) -> int:
@@ -68,22 +68,10 @@ async def ext_export_bookings(
     )
     
     if wants_csv:
-        # Generate CSV
-        buf = StringIO()
-        w = csv.writer(buf)
-        w.writerow(["booking_id", "departure_id", "starts_at", "tour_title", "qty", "net_price"])
-        for booking in bookings:
-            w.writerow([
-                booking["booking_id"],
-                booking["departure_id"],
-                booking["starts_at"] or "",
-                booking["tour_title"],
-                booking["qty"],
-                booking["net_price"],
-            ])
-        buf.seek(0)
+        # Stream CSV in chunks instead of building it in one buffer
+        fieldnames = ["booking_id", "departure_id", "starts_at", "tour_title", "qty", "net_price"]
         return StreamingResponse(
-            buf,
+            iter_csv(fieldnames, bookings),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=bookings.csv"}
         )
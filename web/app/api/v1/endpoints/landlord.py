@@ -2,20 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
 import csv
 import os
+import tempfile
+import traceback
 from urllib.parse import quote_plus, quote
 from datetime import datetime
+from functools import lru_cache
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status, Query, Response
 from fastapi.responses import Response as FastAPIResponse
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-from ....deps import SessionDep
+from ....deps import SessionDep, WritableSessionDep
 from ....security import current_user, role_required
+from ....services import SupportService
 from ....services.landlord_service import LandlordService
+from ....storage import fget_object
 from ....core.exceptions import NotFoundError, ValidationError
 from ..schemas.landlord_schemas import (
     ApartmentIn,
@@ -25,6 +31,7 @@ from ..schemas.landlord_schemas import (
     TourForLandlord,
     EarningsOut,
 )
+from ..routing import ORJSONRoute
 
 # QR code generation imports
 try:
@@ -44,6 +51,7 @@ A6_WIDTH_PT = A6[0] if HAS_QR_SUPPORT else 297.64   # 105mm = 297.64 points
 A6_HEIGHT_PT = A6[1] if HAS_QR_SUPPORT else 419.53  # 148mm = 419.53 points
 
 router = APIRouter(
+    route_class=ORJSONRoute,
     tags=["landlord"],
     dependencies=[Depends(role_required("landlord"))],
 )
@@ -72,6 +80,29 @@ def _bot_link(payload: str) -> str:
     return f"{server_host}/api/v1/public/redirect/apartment/{apt_id}"
 
 
+@lru_cache(maxsize=1024)
+def _qr_png(url: str, high_ec: bool = False) -> bytes:
+    """PNG bytes of the QR code for ``url``; the link fully determines the image"""
+    if high_ec:
+        # High error correction so the code survives being printed over a template
+        qr = qrcode.QRCode(
+            version=None,
+            error_correction=qrcode.constants.ERROR_CORRECT_H,
+            box_size=10,
+            border=2,
+        )
+        qr.add_data(url)
+        qr.make(fit=True)
+        qr_img = qr.make_image(image_factory=PilImage, fill_color="black", back_color="white")
+    else:
+        qr_img = qrcode.make(url, image_factory=PilImage)
+    
+    # Two-colour QR images gain nothing from heavy zlib effort
+    img_buf = io.BytesIO()
+    qr_img.save(img_buf, format="PNG", compress_level=1)
+    return img_buf.getvalue()
+
+
 def _resize_to_a6(img: "PILImage.Image", target_dpi: int = 300) -> "PILImage.Image":
     """
     Resize and center-crop image to A6 format (105mm x 148mm) preserving quality.
@@ -155,7 +186,7 @@ async def list_apartments(
 
 @router.post("/apartments", response_model=ApartmentOut, status_code=status.HTTP_201_CREATED)
 async def create_apartment(
-    payload: ApartmentIn, sess: SessionDep, user=Depends(current_user)
+    payload: ApartmentIn, sess: WritableSessionDep, user=Depends(current_user)
 ):
     """Create a new apartment."""
     landlord_id = await _get_landlord_id(sess, user)
@@ -172,7 +203,7 @@ async def create_apartment(
 
 @router.patch("/apartments/{apt_id}", response_model=ApartmentOut)
 async def update_apartment(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     apt_id: int = Path(..., gt=0),
     payload: ApartmentIn | dict | None = None,
     user=Depends(current_user),
@@ -200,7 +231,7 @@ async def update_apartment(
 # Commission Management
 @router.patch("/tours/{tour_id}/commission", response_model=CommissionBody)
 async def set_tour_commission(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     tour_id: int = Path(..., gt=0),
     body: CommissionBody | None = None,
     user=Depends(current_user),
@@ -324,12 +355,58 @@ async def apartments_qr_pdf(
     qr_template_settings = await service.get_qr_template_settings()
     qr_template_url = qr_template_settings.get('template_url') if qr_template_settings else None
     
-    # Generate PDF
-    buf = io.BytesIO()
-    pdf = _canvas.Canvas(buf, pagesize=A4)
-    page_w, page_h = A4
+    # If apartment is single, use its name; otherwise use "Apartments"
+    apt_name = apartments[0].name if len(apartments) == 1 else "Apartments"
+    
+    # Fetch the template (I/O) here; rendering runs in a worker thread below
+    template_path = None
+    if qr_template_settings and qr_template_url:
+        try:
+            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
+                template_path = temp_file.name
+            await fget_object(qr_template_url, template_path)
+        except Exception as e:
+            print(f"Error using QR template: {str(e)}")
+            traceback.print_exc()
+            if template_path:
+                os.unlink(template_path)
+            template_path = None
+    
+    # QR matrices, PIL compositing, PNG encoding and ReportLab are pure CPU:
+    # keep them off the event loop
+    try:
+        pdf_bytes = await asyncio.to_thread(
+            _render_qr_pdf, apartments, template_path, qr_template_settings
+        )
+    finally:
+        if template_path:
+            try:
+                os.unlink(template_path)
+            except Exception:
+                pass
+    
+    # Properly handle filename encoding for Content-Disposition header
+    # RFC 5987 encoding for non-ASCII characters in HTTP headers
+    filename = apt_name + ".pdf"
+    
+    # For browsers that support RFC 5987
+    filename_ascii = filename.encode('ascii', 'ignore').decode()
+    filename_encoded = quote(filename.encode('utf-8'))
+    
+    if filename_ascii == filename:
+        # ASCII-only filename, use simple format
+        content_disposition = f'attachment; filename="{filename}"'
+    else:
+        # Non-ASCII filename, use both formats for compatibility
+        content_disposition = f'attachment; filename="{filename_ascii}"; filename*=UTF-8\'\'{filename_encoded}'
+    
+    headers = {"Content-Disposition": content_disposition}
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
 
-    # Register a TrueType font that supports Cyrillic characters
+@lru_cache(maxsize=1)
+def _pdf_font_name() -> str:
+    """Register a Cyrillic-capable TTF once per process and return its name"""
     # We'll use DejaVu Sans which has good Unicode support
     # If DejaVu is not available, fall back to Helvetica
     try:
@@ -339,49 +416,40 @@ async def apartments_qr_pdf(
             '/usr/share/fonts/dejavu/DejaVuSans.ttf',          # Some Linux distros
         ]
         
-        font_found = False
         for font_path in system_font_paths:
             if os.path.exists(font_path):
                 pdfmetrics.registerFont(TTFont('DejaVuSans', font_path))
-                font_name = 'DejaVuSans'
-                font_found = True
-                break
+                return 'DejaVuSans'
         
         # If system fonts not found, try our static directory
-        if not font_found:
-            static_font_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 
-                                    'static', 'fonts', 'DejaVuSans.ttf')
-            if os.path.exists(static_font_path):
-                pdfmetrics.registerFont(TTFont('DejaVuSans', static_font_path))
-                font_name = 'DejaVuSans'
-            else:
-                raise FileNotFoundError(f"Font not found at {static_font_path}")
+        static_font_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 
+                                'static', 'fonts', 'DejaVuSans.ttf')
+        if os.path.exists(static_font_path):
+            pdfmetrics.registerFont(TTFont('DejaVuSans', static_font_path))
+            return 'DejaVuSans'
+        raise FileNotFoundError(f"Font not found at {static_font_path}")
                 
     except Exception as e:
         # Fall back to Helvetica (built-in) if no TTF fonts are available
-        font_name = 'Helvetica'
-    
-    # If apartment is single, use its name; otherwise use "Apartments"
-    apt_name = apartments[0].name if len(apartments) == 1 else "Apartments"
+        return 'Helvetica'
+
+
+def _render_qr_pdf(apartments, template_path, qr_template_settings) -> bytes:
+    """Render the apartments' QR PDF (blocking; call via asyncio.to_thread)"""
+    buf = io.BytesIO()
+    pdf = _canvas.Canvas(buf, pagesize=A4)
+    font_name = _pdf_font_name()
     
     # Generate PDF with template if available
-    if qr_template_settings and qr_template_url:
+    if template_path:
         # Template-based QR codes - 4 A6 images per A4 page
         try:
-            from ....storage import presigned, client, BUCKET
-            import tempfile
-
             # Get template settings for QR placement (in original image pixels)
             orig_qr_pos_x = int(qr_template_settings.get('position_x', 50))
             orig_qr_pos_y = int(qr_template_settings.get('position_y', 50))
             orig_qr_width = int(qr_template_settings.get('width', 200))
             orig_qr_height = int(qr_template_settings.get('height', 200))
 
-            # Get template image directly from S3, save to a temp file first
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                client.fget_object(BUCKET, qr_template_url, temp_file.name)
-                template_path = temp_file.name
-
             # Load the image from the temp file at full quality
             template_pil = PILImage.open(template_path)
             orig_width, orig_height = template_pil.size
@@ -411,16 +479,8 @@ async def apartments_qr_pdf(
                 payload = f"apt_{apt.id}"
                 url = _bot_link(payload)
 
-                # Create high-resolution QR code
-                qr = qrcode.QRCode(
-                    version=None,
-                    error_correction=qrcode.constants.ERROR_CORRECT_H,
-                    box_size=10,
-                    border=2,
-                )
-                qr.add_data(url)
-                qr.make(fit=True)
-                qr_img = qr.make_image(image_factory=PilImage, fill_color="black", back_color="white")
+                # High-resolution QR code (cached per link)
+                qr_img = PILImage.open(io.BytesIO(_qr_png(url, high_ec=True)))
 
                 # Resize QR code to target size with high quality
                 qr_img = qr_img.resize((qr_width_px, qr_height_px), PILImage.Resampling.LANCZOS)
@@ -434,9 +494,6 @@ async def apartments_qr_pdf(
 
                 composite_images.append(composite)
 
-            # Clean up temp file
-            os.unlink(template_path)
-
             # Layout: 4 A6 images per A4 page (2 columns x 2 rows)
             # A4 in points: 595.28 x 841.89
             # A6 in points: 297.64 x 419.53
@@ -469,7 +526,7 @@ async def apartments_qr_pdf(
 
                     # Convert composite image to bytes for ReportLab
                     img_io = io.BytesIO()
-                    composite_images[idx].save(img_io, format="PNG", optimize=False)
+                    composite_images[idx].save(img_io, format="PNG", compress_level=1)
                     img_io.seek(0)
 
                     # Draw image at position with exact A6 dimensions
@@ -490,39 +547,14 @@ async def apartments_qr_pdf(
         except Exception as e:
             # Fall back to standard QR code generation if template fails
             print(f"Error using QR template: {str(e)}")
-            import traceback
             traceback.print_exc()
             _generate_standard_qr_pdf(pdf, apartments, font_name)
-            # Clean up temporary file if it exists
-            if 'template_path' in locals():
-                try:
-                    os.unlink(template_path)
-                except Exception:
-                    pass
     else:
         # Standard QR code generation
         _generate_standard_qr_pdf(pdf, apartments, font_name)
     
     pdf.save()
-    buf.seek(0)
-    
-    # Properly handle filename encoding for Content-Disposition header
-    # RFC 5987 encoding for non-ASCII characters in HTTP headers
-    filename = apt_name + ".pdf"
-    
-    # For browsers that support RFC 5987
-    filename_ascii = filename.encode('ascii', 'ignore').decode()
-    filename_encoded = quote(filename.encode('utf-8'))
-    
-    if filename_ascii == filename:
-        # ASCII-only filename, use simple format
-        content_disposition = f'attachment; filename="{filename}"'
-    else:
-        # Non-ASCII filename, use both formats for compatibility
-        content_disposition = f'attachment; filename="{filename_ascii}"; filename*=UTF-8\'\'{filename_encoded}'
-    
-    headers = {"Content-Disposition": content_disposition}
-    return Response(content=buf.getvalue(), media_type="application/pdf", headers=headers)
+    return buf.getvalue()
 
 
 # Helper function for standard QR generation
@@ -537,10 +569,7 @@ def _generate_standard_qr_pdf(pdf, apartments, font_name):
         payload = f"apt_{apt.id}"
         url = _bot_link(payload)
         
-        qr_img = qrcode.make(url, image_factory=PilImage)
-        img_buf = io.BytesIO()
-        qr_img.save(img_buf, format="PNG")
-        img_buf.seek(0)
+        img_buf = io.BytesIO(_qr_png(url))
         
         pdf.drawImage(ImageReader(img_buf), x, y, width=200, height=200)
         
@@ -563,7 +592,11 @@ def _generate_standard_qr_pdf(pdf, apartments, font_name):
 @router.get("/dashboard", response_model=None)
 async def get_dashboard(sess: SessionDep, user=Depends(current_user)):
     """Get landlord dashboard data."""
-    user_id = await _get_landlord_id(sess, user)
+    # get_dashboard_data resolves the landlord itself; no separate lookup first
+    try:
+        user_id = int(user["sub"])
+    except (KeyError, ValueError):
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Invalid landlord token")
     service = LandlordService(sess)
     
     try:
@@ -578,7 +611,6 @@ async def get_dashboard(sess: SessionDep, user=Depends(current_user)):
 @router.get("/payment/status")
 async def get_payment_status(sess: SessionDep, user=Depends(current_user)):
     """Get payment request eligibility and balance info."""
-    from ....services import SupportService
     
     landlord_id = await _get_landlord_id(sess, user)
     support_service = SupportService(sess)
@@ -607,9 +639,8 @@ async def get_payment_status(sess: SessionDep, user=Depends(current_user)):
 
 
 @router.post("/payment/request")
-async def request_payment(sess: SessionDep, user=Depends(current_user)):
+async def request_payment(sess: WritableSessionDep, user=Depends(current_user)):
     """Request a payment for available commissions."""
-    from ....services import SupportService
     
     landlord_id = await _get_landlord_id(sess, user)
     support_service = SupportService(sess)
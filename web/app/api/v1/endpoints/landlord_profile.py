@@ -1,25 +1,23 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
-from app.deps import SessionDep
+from app.deps import SessionDep, WritableSessionDep
 from app.security import current_user, role_required, _extract_token, decode_token
 from app.services.landlord_profile_service import LandlordProfileService
 from app.services.landlord_service import LandlordService
 from app.core.unit_of_work import UnitOfWork
+from app.infrastructure.templates import templates
+from app.api.v1.routing import ORJSONRoute
 
 # Create router with landlord role requirement for all routes
 router = APIRouter(
+    route_class=ORJSONRoute,
     tags=["landlord-profile"],
     dependencies=[Depends(role_required("landlord"))],
 )
 
-# Templates setup
-templates = Jinja2Templates(directory="templates")
-
-
 class PaymentInfoUpdate(BaseModel):
     """Schema for updating payment information"""
     phone_number: Optional[str] = None
@@ -68,7 +66,7 @@ async def get_profile_page(
 @router.post("/profile/payment")
 async def update_payment_info(
     payment_info: PaymentInfoUpdate,
-    sess: SessionDep,
+    sess: WritableSessionDep,
     user=Depends(current_user)
 ):
     """Update landlord payment information"""
@@ -4,14 +4,16 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from ....deps import SessionDep
+from ....deps import SessionDep, WritableSessionDep
 from ....security import current_user, role_required
 from ....services.manager_service import ManagerService
 from ....core.exceptions import NotFoundError, ConflictError
 from ..schemas.manager_schemas import ManagerIn, ManagerOut
 from .utils import get_agency_id
+from ..routing import ORJSONRoute
 
 router = APIRouter(
+    route_class=ORJSONRoute,
     prefix="/managers",
     tags=["managers"],
     dependencies=[Depends(role_required("agency"))],
@@ -28,7 +30,7 @@ async def list_managers(sess: SessionDep, user=Depends(current_user)):
 
 
 @router.post("", response_model=ManagerOut, status_code=status.HTTP_201_CREATED)
-async def create_manager(payload: ManagerIn, sess: SessionDep, user=Depends(current_user)):
+async def create_manager(payload: ManagerIn, sess: WritableSessionDep, user=Depends(current_user)):
     """Create a new manager for the agency."""
     agency_id = get_agency_id(user)
     service = ManagerService(sess)
@@ -47,7 +49,7 @@ async def create_manager(payload: ManagerIn, sess: SessionDep, user=Depends(curr
 
 
 @router.delete("/{mgr_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_manager(mgr_id: int, sess: SessionDep, user=Depends(current_user)):
+async def delete_manager(mgr_id: int, sess: WritableSessionDep, user=Depends(current_user)):
     """Delete a manager from the agency."""
     agency_id = get_agency_id(user)
     service = ManagerService(sess)
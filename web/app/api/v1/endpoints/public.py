@@ -11,7 +11,7 @@ from fastapi.responses import RedirectResponse
 import logging
 import os
 
-from ....deps import SessionDep
+from ....deps import SessionDep, WritableSessionDep
 from ....security import current_user, role_required
 from ....services.public_service import PublicService
 from ....core.exceptions import NotFoundError, ValidationError, ConflictError
@@ -32,12 +32,18 @@ from ..schemas.public_schemas import (
     BookingIn,
     BookingCreatedResponse,
 )
+from ..routing import ORJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 logger = logging.getLogger(__name__)
 BOT_ALIAS = os.getenv("BOT_ALIAS", "TravellitoBot")
 
 
+async def _anonymous_user() -> dict | None:
+    """Placeholder user dependency for public routes (async to skip the threadpool)"""
+    return None
+
+
 # Tour Search and Listing
 @router.get("/tours/search", response_model=list[TourSearchOut])
 async def search_tours(
@@ -54,7 +60,7 @@ async def search_tours(
     duration_max: int | None = Query(None, gt=0),
     limit: int = Query(50, gt=0, le=100),
     offset: int = Query(0, ge=0),
-    user: dict | None = Depends(lambda: None),
+    user: dict | None = Depends(_anonymous_user),
 ):
     """Search tours with filters and return discounted price."""
     service = PublicService(sess)
@@ -142,7 +148,7 @@ async def redirect_apartment_qr(
 # Tour Categories
 @router.get("/tours/{tour_id}/categories", response_model=list[CategoryOut])
 async def tour_categories(
-    tour_id: int, sess: SessionDep, user: dict | None = Depends(lambda: None)
+    tour_id: int, sess: SessionDep, user: dict | None = Depends(_anonymous_user)
 ):
     """List ticket categories including discounted price."""
     service = PublicService(sess)
@@ -242,7 +248,7 @@ async def list_repetition_types(sess: SessionDep):
 @router.post("/signup/landlord", status_code=status.HTTP_201_CREATED)
 async def landlord_signup(
     payload: LandlordSignupRequest,
-    sess: SessionDep
+    sess: WritableSessionDep
 ):
     """Create a new landlord user."""
     service = PublicService(sess)
@@ -259,7 +265,7 @@ async def landlord_signup(
 @router.post("/bookings", response_model=BookingCreatedResponse, dependencies=[Depends(role_required("bot_user"))])
 async def create_booking(
     payload: BookingIn,
-    sess: SessionDep,
+    sess: WritableSessionDep,
     request: Request,
     user=Depends(current_user)
 ):
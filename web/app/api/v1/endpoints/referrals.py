@@ -4,13 +4,15 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from ....deps import SessionDep
+from ....deps import WritableSessionDep
 from ....security import role_required, current_user
 from ....services.referral_service import ReferralService
 from ....core.exceptions import NotFoundError
 from ..schemas.referral_schemas import ReferralIn, ScanIn, ReferralResponse
+from ..routing import ORJSONRoute
 
 router = APIRouter(
+    route_class=ORJSONRoute,
     prefix="/referrals",
     tags=["referrals"],
     dependencies=[Depends(role_required("bot_user"))]
@@ -19,7 +21,7 @@ router = APIRouter(
 
 @router.post("/", response_model=ReferralResponse, status_code=status.HTTP_201_CREATED)
 async def record_referral(
-    payload: ReferralIn, sess: SessionDep, user=Depends(current_user)
+    payload: ReferralIn, sess: WritableSessionDep, user=Depends(current_user)
 ):
     """Register that the current user has scanned a landlord's QR.
     
@@ -40,7 +42,7 @@ async def record_referral(
 
 @router.post("/scan", response_model=ReferralResponse, status_code=status.HTTP_201_CREATED)
 async def record_scan(
-    payload: ScanIn, sess: SessionDep, user=Depends(current_user)
+    payload: ScanIn, sess: WritableSessionDep, user=Depends(current_user)
 ):
     """Variant of referral registration that receives apartment_id.
     
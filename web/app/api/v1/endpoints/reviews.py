@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import logging
 
 from app.api.v1.schemas.tour_schemas import TourReviewCreate, TourReviewOut, TourReviewUpdate
 from app.deps import SessionDep
+from app.models import User
 from app.security import current_user
 from app.services.tour_service import TourService
 from app.core.exceptions import NotFoundError, ValidationError, AuthorizationError
+from app.api.v1.routing import ORJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 logger = logging.getLogger(__name__)
 
@@ -96,9 +99,6 @@ async def create_review_from_bot(
         logger.info(f"Bot creating review: tg_user_id={tg_user_id}, booking_id={review.booking_id}, tour_id={review.tour_id}")
         
         # Get user by telegram ID
-        from app.models import User
-        from sqlalchemy import select
-        
         stmt = select(User).where(User.tg_id == tg_user_id)
         result = await sess.execute(stmt)
         db_user = result.scalar_one_or_none()
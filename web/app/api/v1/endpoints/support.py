@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
+from sqlalchemy import select, and_
+from sqlalchemy.orm import selectinload
 
-from ....deps import SessionDep
+from ....deps import SessionDep, WritableSessionDep
+from ....models import SupportMessage, SupportResponse, User
 from app.security import current_user
 from ....services import SupportService
 from ..schemas.support_schemas import (
@@ -9,13 +12,14 @@ from ..schemas.support_schemas import (
     PaymentRequestOut, PaymentProcessRequest
 )
 from ....core.exceptions import NotFoundError, ValidationError
+from ..routing import ORJSONRoute
 
-router = APIRouter(prefix="/support", tags=["support"])
+router = APIRouter(prefix="/support", tags=["support"], route_class=ORJSONRoute)
 
 
 @router.post("/messages", response_model=SupportMessageOut)
 async def create_support_message(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     data: SupportMessageCreate,
     user=Depends(current_user)
 ):
@@ -31,9 +35,6 @@ async def create_support_message(
         
         # Manually construct the response to avoid lazy loading
         # Get the user object explicitly
-        from sqlalchemy import select
-        from ....models import User
-        
         user_stmt = select(User).where(User.id == message.user_id)
         user_obj = await sess.scalar(user_stmt)
         
@@ -62,8 +63,8 @@ async def list_support_messages(
     sess: SessionDep,
     status: Optional[str] = None,
     message_type: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, gt=0, le=500),
+    offset: int = Query(0, ge=0),
     user=Depends(current_user)
 ):
     """List support messages. Admin only."""
@@ -73,10 +74,6 @@ async def list_support_messages(
     service = SupportService(sess)
     
     # Use the modified method that uses eager loading
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-    from ....models import SupportMessage, User, SupportResponse
-    
     # Build the query with proper eager loading
     stmt = select(SupportMessage).options(
         selectinload(SupportMessage.user),
@@ -155,10 +152,6 @@ async def get_support_message(
 ):
     """Get a specific support message. Admin or message owner only."""
     # Use direct query with eager loading 
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-    from ....models import SupportMessage, SupportResponse
-    
     stmt = (
         select(SupportMessage)
         .where(SupportMessage.id == message_id)
@@ -226,7 +219,7 @@ async def get_support_message(
 
 @router.post("/messages/{message_id}/respond")
 async def respond_to_message(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     message_id: int,
     data: SupportResponseCreate,
     user=Depends(current_user)
@@ -258,8 +251,6 @@ async def respond_to_message(
 @router.get("/internal/admin-telegram-ids")
 async def get_admin_telegram_ids(sess: SessionDep):
     """Internal endpoint to get admin users with telegram IDs."""
-    from sqlalchemy import select, and_
-    from ....models import User
     
     stmt = select(User.tg_id).where(
         and_(
@@ -267,8 +258,7 @@ async def get_admin_telegram_ids(sess: SessionDep):
             User.tg_id.isnot(None)
         )
     )
-    result = await sess.execute(stmt)
-    admin_ids = [row[0] for row in result]
+    admin_ids = list((await sess.scalars(stmt)).all())
     
     return admin_ids
 
@@ -277,7 +267,7 @@ async def get_admin_telegram_ids(sess: SessionDep):
 
 @router.post("/payment-requests/{request_id}/process")
 async def process_payment_request(
-    sess: SessionDep,
+    sess: WritableSessionDep,
     request_id: int,
     data: PaymentProcessRequest,
     user=Depends(current_user)
@@ -1,18 +1,19 @@
 from typing import List
-from fastapi import APIRouter, Depends, File, UploadFile, status, Query
+from fastapi import APIRouter, Depends, File, UploadFile, status, Query, Response
 import pytz
 from datetime import datetime, time
 
-from app.api.v1.schemas import TourIn, TourOut, TourUpdate, ImagesOut, TicketCategoryIn, TicketCategoryOut
+from app.api.v1.schemas import TourIn, TourOut, TourOutBrief, TourUpdate, ImagesOut, TicketCategoryIn, TicketCategoryOut
 from app.api.v1.schemas.tour_schemas import RepetitionIn, RepetitionOut
 from app.api.v1.endpoints.utils import get_agency_id
-from app.deps import SessionDep
+from app.deps import SessionDep, WritableSessionDep
 from app.security import current_user, role_required
 from app.services import TourService
 from app.core import BaseError
+from app.api.v1.routing import ORJSONRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 def convert_to_local_time(tour, timezone_str="UTC"):
     """Convert UTC time to local time for frontend display"""
@@ -48,6 +49,20 @@ def convert_to_local_time(tour, timezone_str="UTC"):
     
     return tour
 
+@router.get("", response_model=List[TourOutBrief])
+async def list_tours_brief(
+    sess: SessionDep,
+    user=Depends(current_user),
+):
+    """List id/title of the agency's tours (e.g. for departure forms)"""
+    agency_id = get_agency_id(user)
+    service = TourService(sess)
+    
+    rows = await service.get_agency_tours_brief(agency_id)
+    
+    return [TourOutBrief.model_validate(row) for row in rows]
+
+
 @router.get("/list", response_model=List[TourOut])
 async def list_tours(
     sess: SessionDep,
@@ -69,7 +84,9 @@ async def list_tours(
     for tour in tours:
         convert_to_local_time(tour)
     
-    return [TourOut.model_validate(tour) for tour in tours]
+    # Serialize in pydantic-core; response_model is kept for the OpenAPI schema
+    tours_out = TourOut.validate_many(tours)
+    return Response(content=TourOut.dump_many_json(tours_out), media_type="application/json")
 
 
 @router.post("/create", response_model=TourOut, status_code=status.HTTP_201_CREATED)
@@ -171,7 +188,7 @@ async def delete_tour(
 @router.post("/{tour_id}/images", response_model=ImagesOut, status_code=status.HTTP_201_CREATED)
 async def upload_tour_images(
     tour_id: int,
-    sess: SessionDep,
+    sess: WritableSessionDep,
     files: List[UploadFile] = File(...),
     user=Depends(current_user),
 ):
@@ -305,16 +322,7 @@ async def list_repetitions(
     agency_id = get_agency_id(user)
     service = TourService(sess)
     reps = await service.list_repetitions(tour_id, agency_id)
-    # Convert times to HH:MM for response
-    out = []
-    for r in reps:
-        out.append(RepetitionOut.model_validate({
-            "id": r.id,
-            "repeat_type": r.repeat_type,
-            "repeat_weekdays": r.repeat_weekdays,
-            "repeat_time": r.repeat_time.strftime("%H:%M") if r.repeat_time else None,
-        }))
-    return out
+    return [RepetitionOut.model_validate(r) for r in reps]
 
 @router.post("/{tour_id}/repetitions", response_model=RepetitionOut, status_code=status.HTTP_201_CREATED)
 async def create_repetition(
@@ -334,12 +342,7 @@ async def create_repetition(
         repeat_weekdays=payload.repeat_weekdays,
     )
     await sess.commit()
-    return RepetitionOut.model_validate({
-        "id": rep.id,
-        "repeat_type": rep.repeat_type,
-        "repeat_weekdays": rep.repeat_weekdays,
-        "repeat_time": rep.repeat_time.strftime("%H:%M") if rep.repeat_time else None,
-    })
+    return RepetitionOut.model_validate(rep)
 
 @router.patch("/{tour_id}/repetitions/{repetition_id}", response_model=RepetitionOut)
 async def update_repetition(
@@ -361,12 +364,7 @@ async def update_repetition(
         repeat_weekdays=payload.repeat_weekdays,
     )
     await sess.commit()
-    return RepetitionOut.model_validate({
-        "id": rep.id,
-        "repeat_type": rep.repeat_type,
-        "repeat_weekdays": rep.repeat_weekdays,
-        "repeat_time": rep.repeat_time.strftime("%H:%M") if rep.repeat_time else None,
-    })
+    return RepetitionOut.model_validate(rep)
 
 @router.delete("/{tour_id}/repetitions/{repetition_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_repetition(
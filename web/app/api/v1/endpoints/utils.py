@@ -1,5 +1,10 @@
+import csv
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Union
+
 from app.core import BaseError
 
+CSV_CHUNK_SIZE = 64 * 1024  # flush encoded CSV to the client in ~64KB chunks
+
 
 def get_agency_id(user: dict) -> int:
     """Extract agency ID from user token"""
@@ -22,4 +27,50 @@ def get_user_role(user: dict) -> str:
     role = user.get("role")
     if not role:
         raise BaseError("Invalid user token", status_code=401)
-    return role 
\ No newline at end of file
+    return role
+
+
+class _CsvBuffer:
+    """Write-only sink for csv.writer that hands out encoded chunks"""
+    
+    def __init__(self):
+        self._parts: List[str] = []
+        self.size = 0
+    
+    def write(self, data: str) -> None:
+        self._parts.append(data)
+        self.size += len(data)
+    
+    def pop(self) -> bytes:
+        data = "".join(self._parts).encode()
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+async def iter_csv(
+    fieldnames: List[str],
+    rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    """Yield UTF-8 CSV for *rows* in chunks, for use with StreamingResponse
+    
+    Keys not in *fieldnames* are ignored. *rows* may be a plain or async
+    iterable, so results can flow from the database without a full list.
+    """
+    buf = _CsvBuffer()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
+    if fieldnames:
+        writer.writeheader()
+    
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            writer.writerow(row)
+            if buf.size >= CSV_CHUNK_SIZE:
+                yield buf.pop()
+    else:
+        for row in rows:
+            writer.writerow(row)
+            if buf.size >= CSV_CHUNK_SIZE:
+                yield buf.pop()
+    
+    yield buf.pop()
@@ -1,5 +1,5 @@
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -8,6 +8,9 @@ from jose import JWTError
 import time
 
 from app.core import BaseError
+from app.infrastructure.database import get_session
+from app.services.auth_service import AuthService
+from app.services.landlord_service import LandlordService
 from app.security import decode_token, ACCESS_TOKEN_EXP_SECONDS, REFRESH_TOKEN_EXP_SECONDS, _extract_token, _extract_refresh_token, mint_tokens
 
 
@@ -37,10 +40,6 @@ class TokenRefreshMiddleware(BaseHTTPMiddleware):
             
             # If we got a 401, it might be due to an expired token
             if response.status_code == 401:
-                # Get database session
-                from app.deps import get_session
-                from app.services.auth_service import AuthService
-                
                 # Create a new session for this middleware
                 async for session in get_session():
                     try:
@@ -116,28 +115,42 @@ class ClientIDMiddleware(BaseHTTPMiddleware):
         return response
 
 
-async def exception_handler(request: Request, call_next):
-    """Global exception handler middleware"""
-    try:
-        return await call_next(request)
-    except BaseError as exc:
-        # Handle our custom exceptions
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "error": exc.message,
-                "details": exc.details
-            }
-        )
-    except Exception as exc:
-        # Handle unexpected exceptions
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Internal server error",
-                "details": {}
-            }
-        )
+API_PREFIX = "/api/v1"
+
+
+def _is_api_request(request: Request) -> bool:
+    return request.url.path.startswith(API_PREFIX)
+
+
+async def base_error_handler(request: Request, exc: BaseError):
+    """Map our custom exceptions to their status code"""
+    if not _is_api_request(request):
+        return PlainTextResponse(exc.message, status_code=exc.status_code)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "error": exc.message,
+            "details": exc.details
+        }
+    )
+
+
+async def exception_handler(request: Request, exc: Exception):
+    """Last-resort handler for unexpected exceptions
+    
+    Starlette only calls this once something has raised, so healthy
+    requests (health probes, static files) never pass through it. API
+    clients get the JSON error envelope; pages get a plain 500.
+    """
+    if not _is_api_request(request):
+        return PlainTextResponse("Internal Server Error", status_code=500)
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal server error",
+            "details": {}
+        }
+    )
 
 
 async def get_landlord_for_templates(request: Request, sess, user):
@@ -150,9 +163,6 @@ async def get_landlord_for_templates(request: Request, sess, user):
         return None
         
     try:
-        # Import here to avoid circular imports
-        from app.services.landlord_service import LandlordService
-        
         service = LandlordService(sess)
         landlord = await service.get_landlord_by_user_id(int(user["sub"]))
         return landlord
@@ -0,0 +1,28 @@
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is parsed with orjson instead of stdlib json"""
+    
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+            # FastAPI still turns malformed bodies into a 422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that hands endpoints an ORJSONRequest"""
+    
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+        
+        return route_handler
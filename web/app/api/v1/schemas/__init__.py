@@ -1,4 +1,4 @@
-from .tour_schemas import TourIn, TourOut, TourUpdate, ImagesOut, TicketCategoryIn, TicketCategoryOut, RepetitionIn, RepetitionOut
+from .tour_schemas import TourIn, TourOut, TourOutBrief, TourUpdate, ImagesOut, TicketCategoryIn, TicketCategoryOut, RepetitionIn, RepetitionOut
 from .departure_schemas import DepartureIn, DepartureOut, DepartureUpdate, CapacityUpdate
 from .booking_schemas import BookingStatusUpdate, BookingOut, BookingExportOut, BookingMetrics, CategoryBreakdown
 from .auth_schemas import (
@@ -10,6 +10,7 @@ __all__ = [
     # Tour schemas
     "TourIn",
     "TourOut",
+    "TourOutBrief",
     "TourUpdate",
     "ImagesOut",
     "TicketCategoryIn",
@@ -1,6 +1,18 @@
-from typing import Optional, List
+from typing import Optional, List, Iterable, Any, Dict, Annotated
+from datetime import time
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, BeforeValidator, field_validator
+
+
+def _format_hhmm(value: Any) -> Any:
+    """Render ``datetime.time`` values as HH:MM strings"""
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    return value
+
+
+# String time field that also accepts ORM ``Time`` column values
+HHMMTime = Annotated[str, BeforeValidator(_format_hhmm)]
 
 
 # Repetition schemas defined early to avoid forward refs
@@ -14,7 +26,7 @@ class RepetitionOut(BaseModel):
     id: int
     repeat_type: str
     repeat_weekdays: Optional[List[int]] = None
-    repeat_time: str
+    repeat_time: HHMMTime
 
     model_config = {
         "from_attributes": True,
@@ -89,6 +101,7 @@ class TourOut(BaseModel):
 
     model_config = {
         "from_attributes": True,
+        "extra": "ignore",  # stray ORM attributes (e.g. legacy category_id) are dropped
     }
     
     @classmethod
@@ -96,39 +109,66 @@ class TourOut(BaseModel):
         """Custom validation to handle time conversion"""
         if hasattr(obj, "__dict__"):
             # If it's an ORM object, handle time conversion
-            data = {**obj.__dict__}
-            # Remove category_id field as it's deprecated
-            if "category_id" in data:
-                del data["category_id"]
-                
-            if hasattr(obj, "repeat_time") and obj.repeat_time is not None:
-                data["repeat_time"] = obj.repeat_time.strftime("%H:%M") if obj.repeat_time else None
-                
-            # Handle categories
-            if hasattr(obj, "tour_categories"):
-                data["category_ids"] = [cat.id for cat in obj.tour_categories]
-                data["categories"] = [cat.name for cat in obj.tour_categories]
-            
-            # Handle repetitions if loaded
-            reps_out = []
-            if hasattr(obj, "repetitions") and obj.repetitions is not None:
-                for r in obj.repetitions:
-                    try:
-                        time_str = r.repeat_time.strftime("%H:%M") if r.repeat_time else None
-                    except Exception:
-                        time_str = None
-                    reps_out.append({
-                        "id": r.id,
-                        "repeat_type": r.repeat_type,
-                        "repeat_weekdays": r.repeat_weekdays,
-                        "repeat_time": time_str,
-                    })
-            if reps_out:
-                data["repetitions"] = reps_out
-                
-            return super().model_validate(data, *args, **kwargs)
+            return super().model_validate(_tour_to_dict(obj), *args, **kwargs)
         return super().model_validate(obj, *args, **kwargs)
 
+    @classmethod
+    def validate_many(cls, objs: Iterable[Any]) -> List["TourOut"]:
+        """Validate a batch of tours with a single pydantic-core call"""
+        data = [_tour_to_dict(obj) if hasattr(obj, "__dict__") else obj for obj in objs]
+        return _TOUR_LIST_ADAPTER.validate_python(data, from_attributes=True)
+
+    @classmethod
+    def dump_many_json(cls, tours: List["TourOut"]) -> bytes:
+        """Serialize validated tours straight to JSON bytes via pydantic-core"""
+        return _TOUR_LIST_ADAPTER.dump_json(tours, by_alias=True)
+
+
+def _tour_to_dict(obj: Any) -> Dict[str, Any]:
+    """Flatten an ORM tour into the plain dict shape expected by TourOut"""
+    # Explicit whitelist: avoids copying _sa_instance_state and unused columns
+    data = {
+        "id": obj.id,
+        "title": obj.title,
+        "description": obj.description,
+        "duration_minutes": obj.duration_minutes,
+        "city_id": obj.city_id,
+        "address": obj.address,
+        "latitude": obj.latitude,
+        "longitude": obj.longitude,
+        "repeat_type": obj.repeat_type,
+        "repeat_weekdays": obj.repeat_weekdays,
+        "repeat_time": _format_hhmm(obj.repeat_time),
+        "local_time": getattr(obj, "local_time", None),  # set by convert_to_local_time
+        "booking_template": getattr(obj, "booking_template", None),
+    }
+
+    # Handle categories
+    if hasattr(obj, "tour_categories"):
+        data["category_ids"] = [cat.id for cat in obj.tour_categories]
+        data["categories"] = [cat.name for cat in obj.tour_categories]
+
+    # Handle repetitions if loaded (validated in one call, times normalised by RepetitionOut)
+    if hasattr(obj, "repetitions") and obj.repetitions is not None:
+        data["repetitions"] = _REP_LIST_ADAPTER.validate_python(obj.repetitions, from_attributes=True)
+
+    return data
+
+
+# Built once at import time; reused for every bulk validation
+_REP_LIST_ADAPTER = TypeAdapter(List[RepetitionOut])
+_TOUR_LIST_ADAPTER = TypeAdapter(List[TourOut])
+
+
+class TourOutBrief(BaseModel):
+    """Lean tour schema for pickers and lists that only need id and title"""
+    id: int
+    title: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True,
+    }
+
 
 class ImagesOut(BaseModel):
     """Schema for image upload response"""
@@ -2,7 +2,6 @@
 
 import os
 import hmac
-import hashlib
 import time
 from urllib.parse import parse_qsl
 from typing import Dict, Tuple, Optional
@@ -10,6 +9,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# WebApp signing key derived from BOT_TOKEN; computed once on first verification
+_SECRET_KEY: Optional[bytes] = None
+
 def verify_telegram_webapp_data(init_data: str, max_age_seconds: int = 86400) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """
     Verify the integrity and authenticity of Telegram WebApp initData.
@@ -48,37 +50,39 @@ def verify_telegram_webapp_data(init_data: str, max_age_seconds: int = 86400) ->
     except ValueError:
         return False, None, "Invalid auth_date format"
     
+    # Reject malformed hashes before spending any HMAC work on them
+    # (a valid signature is a 64-char hex encoded SHA-256 digest)
+    if len(data_dict["hash"]) != 64:
+        return False, None, "Invalid hash format"
+    try:
+        received_digest = bytes.fromhex(data_dict["hash"])
+    except ValueError:
+        return False, None, "Invalid hash format"
+    
     # Get the hash from the data and remove it for validation
     hash_value = data_dict.pop("hash")
     
-    # Get bot token
-    bot_token = os.getenv("BOT_TOKEN")
-    if not bot_token:
-        logger.error("BOT_TOKEN environment variable is not set")
-        return False, None, "BOT_TOKEN not configured"
-    
-    # Step 1: Create HMAC-SHA256 of the bot token using "WebAppData" as the key
-    secret_key = hmac.new(
-        "WebAppData".encode(),
-        bot_token.encode(),
-        hashlib.sha256
-    ).digest()
+    # Step 1: HMAC-SHA256 of the bot token using "WebAppData" as the key (cached)
+    global _SECRET_KEY
+    if _SECRET_KEY is None:
+        bot_token = os.getenv("BOT_TOKEN")
+        if not bot_token:
+            logger.error("BOT_TOKEN environment variable is not set")
+            return False, None, "BOT_TOKEN not configured"
+        _SECRET_KEY = hmac.digest(b"WebAppData", bot_token.encode(), "sha256")
     
     # Step 2: Build the data check string
     data_check_string = "\n".join([f"{k}={v}" for k, v in sorted(data_dict.items())])
     
     # Step 3: Calculate HMAC-SHA256 signature using the secret key from step 1
-    computed_hash = hmac.new(
-        secret_key,
-        data_check_string.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    # (one-shot hmac.digest avoids building an HMAC object and hex-encoding)
+    computed_digest = hmac.digest(_SECRET_KEY, data_check_string.encode(), "sha256")
     
-    logger.debug(f"Computed hash: {computed_hash}")
+    logger.debug(f"Computed hash: {computed_digest.hex()}")
     logger.debug(f"Received hash: {hash_value}")
     
     # Use constant-time comparison to prevent timing attacks
-    is_valid = hmac.compare_digest(computed_hash, hash_value)
+    is_valid = hmac.compare_digest(computed_digest, received_digest)
     
     # Add the hash back to the data dictionary for completeness
     data_dict["hash"] = hash_value
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List, Any, Dict
+from typing import Generic, TypeVar, Optional, List, Any, Dict, ClassVar
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy import select, func, inspect, update, delete, literal
+from sqlalchemy.orm import DeclarativeMeta, InstrumentedAttribute, raiseload
+
+from .config import get_settings
 
 T = TypeVar('T')
 ModelType = TypeVar('ModelType', bound=DeclarativeMeta)
@@ -33,12 +35,18 @@ class IRepository(ABC, Generic[ModelType]):
         pass
     
     @abstractmethod
-    async def update(self, *, id: Any, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+    async def update(
+        self,
+        *,
+        id: Any,
+        obj_in: Dict[str, Any],
+        via_orm: bool = False
+    ) -> Optional[ModelType]:
         """Update existing entity"""
         pass
     
     @abstractmethod
-    async def delete(self, *, id: Any) -> bool:
+    async def delete(self, *, id: Any, via_orm: bool = False) -> bool:
         """Delete entity"""
         pass
     
@@ -46,14 +54,64 @@ class IRepository(ABC, Generic[ModelType]):
     async def count(self, *, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count entities"""
         pass
+    
+    @abstractmethod
+    async def exists(self, *, filters: Optional[Dict[str, Any]] = None) -> bool:
+        """Check whether any entity matches"""
+        pass
 
 
 class BaseRepository(IRepository[ModelType], Generic[ModelType]):
     """Base repository implementation with common CRUD operations"""
     
+    # Column attributes resolved once per model class and shared by all instances
+    _column_cache: ClassVar[Dict[type, Dict[str, InstrumentedAttribute]]] = {}
+    
     def __init__(self, model: type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
+        self._cols = self._resolve_columns(model)
+    
+    @classmethod
+    def _resolve_columns(cls, model: type) -> Dict[str, InstrumentedAttribute]:
+        """Return the cached attribute-name -> column map for *model*"""
+        cols = cls._column_cache.get(model)
+        if cols is None:
+            cols = {
+                attr.key: getattr(model, attr.key)
+                for attr in inspect(model).column_attrs
+            }
+            cls._column_cache[model] = cols
+        return cols
+    
+    @staticmethod
+    def _loader_options(*options: Any) -> tuple:
+        """Return *options*, adding raiseload("*") when DB_STRICT_LOADING is on
+        
+        Any relationship not eagerly loaded by *options* then raises on access
+        instead of silently issuing a lazy load (N+1).
+        """
+        if get_settings().DB_STRICT_LOADING:
+            return (*options, raiseload("*"))
+        return options
+    
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        """Add equality conditions for filter keys that map to model columns"""
+        if not filters:
+            return query
+        
+        # Most callers filter on a single column
+        if len(filters) == 1:
+            (key, value), = filters.items()
+            col = self._cols.get(key)
+            return query if col is None else query.where(col == value)
+        
+        conditions = [
+            col == value
+            for key, value in filters.items()
+            if (col := self._cols.get(key)) is not None
+        ]
+        return query.where(*conditions) if conditions else query
     
     async def get(self, id: Any) -> Optional[ModelType]:
         """Get entity by ID"""
@@ -67,26 +125,54 @@ class BaseRepository(IRepository[ModelType], Generic[ModelType]):
         filters: Optional[Dict[str, Any]] = None
     ) -> List[ModelType]:
         """Get multiple entities with pagination and filtering"""
-        query = select(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.where(getattr(self.model, key) == value)
-        
+        query = self._apply_filters(select(self.model), filters)
         query = query.offset(skip).limit(limit)
         result = await self.session.execute(query)
         return list(result.scalars().all())
     
     async def create(self, *, obj_in: Dict[str, Any]) -> ModelType:
-        """Create new entity"""
+        """Create new entity.
+        
+        Writes are batched until the session commits; a flush is only issued
+        here when the caller needs the database-generated primary key.
+        """
         db_obj = self.model(**obj_in)
         self.session.add(db_obj)
-        await self.session.flush()
+        if obj_in.get("id") is None:
+            await self.session.flush()
         return db_obj
     
-    async def update(self, *, id: Any, obj_in: Dict[str, Any]) -> Optional[ModelType]:
-        """Update existing entity"""
+    async def update(
+        self,
+        *,
+        id: Any,
+        obj_in: Dict[str, Any],
+        via_orm: bool = False
+    ) -> Optional[ModelType]:
+        """Update existing entity.
+        
+        By default issues a single ``UPDATE ... RETURNING`` statement. Pass
+        ``via_orm=True`` to load the object and set attributes through the
+        unit of work instead (e.g. when ORM events or relationships must fire).
+        """
+        if via_orm:
+            return await self._update_via_orm(id, obj_in)
+        
+        values = {key: value for key, value in obj_in.items() if key in self._cols}
+        if not values:
+            return await self.get(id)
+        
+        stmt = (
+            update(self.model)
+            .where(self._cols["id"] == id)
+            .values(**values)
+            .returning(self.model)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def _update_via_orm(self, id: Any, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        """Update entity by loading it and setting attributes one by one"""
         db_obj = await self.get(id)
         if not db_obj:
             return None
@@ -95,30 +181,46 @@ class BaseRepository(IRepository[ModelType], Generic[ModelType]):
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         
-        await self.session.flush()
         return db_obj
     
-    async def delete(self, *, id: Any) -> bool:
-        """Delete entity"""
+    async def delete(self, *, id: Any, via_orm: bool = False) -> bool:
+        """Delete entity.
+        
+        By default issues a single ``DELETE ... RETURNING`` statement. Pass
+        ``via_orm=True`` for models that rely on ORM-level cascades
+        (``cascade="all, delete-orphan"``, secondary tables).
+        """
+        if via_orm:
+            return await self._delete_via_orm(id)
+        
+        stmt = (
+            delete(self.model)
+            .where(self._cols["id"] == id)
+            .returning(literal(1))
+        )
+        result = await self.session.execute(stmt)
+        return result.first() is not None
+    
+    async def _delete_via_orm(self, id: Any) -> bool:
+        """Delete entity by loading it and deleting through the session"""
         db_obj = await self.get(id)
         if not db_obj:
             return False
         
         await self.session.delete(db_obj)
-        await self.session.flush()
         return True
     
     async def count(self, *, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count entities"""
-        query = select(func.count()).select_from(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.where(getattr(self.model, key) == value)
-        
+        query = self._apply_filters(select(func.count()).select_from(self.model), filters)
         result = await self.session.execute(query)
         return result.scalar() or 0
+    
+    async def exists(self, *, filters: Optional[Dict[str, Any]] = None) -> bool:
+        """Check whether any entity matches; stops at the first row unlike count()"""
+        query = self._apply_filters(select(literal(1)).select_from(self.model), filters)
+        result = await self.session.execute(query.limit(1))
+        return result.first() is not None
 
 
 class IService(ABC):
@@ -1,74 +1,111 @@
 import os
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet
 from functools import lru_cache
 
 
+def _env_str(name: str, default: str = "") -> Callable[[], str]:
+    """Default factory reading a string from the environment"""
+    return lambda: os.getenv(name, default)
+
+
+def _env_int(name: str, default: int) -> Callable[[], int]:
+    """Default factory reading an integer from the environment"""
+    return lambda: int(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool = False) -> Callable[[], bool]:
+    """Default factory reading a "true"/"false" flag from the environment"""
+    return lambda: os.getenv(name, str(default).lower()).lower() == "true"
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Application settings following Single Responsibility Principle"""
-    
+
     # Database
-    DB_DSN: str = os.getenv("DB_DSN", "")
-    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
-    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
-    
+    DB_DSN: str = field(default_factory=_env_str("DB_DSN"))
+    DB_POOL_SIZE: int = field(default_factory=_env_int("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW: int = field(default_factory=_env_int("DB_MAX_OVERFLOW", 40))
+    DB_POOL_TIMEOUT: int = field(default_factory=_env_int("DB_POOL_TIMEOUT", 10))  # fail fast when saturated
+    # Let PgBouncer own pooling: open/close a server connection per checkout
+    DB_NULL_POOL: bool = field(default_factory=_env_bool("DB_NULL_POOL"))
+    DB_ECHO: bool = field(default_factory=_env_bool("DB_ECHO"))
+    # Raise on unplanned lazy loads in repositories that opt in (dev/staging)
+    DB_STRICT_LOADING: bool = field(default_factory=_env_bool("DB_STRICT_LOADING"))
+    # Behind PgBouncer (transaction mode) set DB_NULL_POOL=true and DB_POOL_PRE_PING=false
+    DB_POOL_PRE_PING: bool = field(default_factory=_env_bool("DB_POOL_PRE_PING", True))
+    DB_POOL_RECYCLE: int = field(default_factory=_env_int("DB_POOL_RECYCLE", 1800))
+    # Per-connection prepared statement cache; set DB_STATEMENT_CACHE_SIZE=0 behind PgBouncer
+    DB_STATEMENT_CACHE_SIZE: int = field(default_factory=_env_int("DB_STATEMENT_CACHE_SIZE", 512))
+    DB_COMMAND_TIMEOUT: int = field(default_factory=_env_int("DB_COMMAND_TIMEOUT", 60))  # seconds per statement
+    DB_CONNECT_TIMEOUT: int = field(default_factory=_env_int("DB_CONNECT_TIMEOUT", 10))
+
     # Security
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "")
+    SECRET_KEY: str = field(default_factory=_env_str("SECRET_KEY"))
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_SECONDS: int = int(os.getenv("JWT_ACCESS_TTL", "900"))  # 15 minutes
-    REFRESH_TOKEN_EXPIRE_SECONDS: int = int(os.getenv("JWT_REFRESH_TTL", str(60 * 60 * 24 * 30)))  # 30 days
-    
-    # CORS
-    CORS_ALLOW_ORIGINS: List[str] = []
+    ACCESS_TOKEN_EXPIRE_SECONDS: int = field(default_factory=_env_int("JWT_ACCESS_TTL", 900))  # 15 minutes
+    REFRESH_TOKEN_EXPIRE_SECONDS: int = field(default_factory=_env_int("JWT_REFRESH_TTL", 60 * 60 * 24 * 30))  # 30 days
+
+    # CORS (filled in by __post_init__)
+    CORS_ALLOW_ORIGINS: FrozenSet[str] = frozenset()
     CORS_ALLOW_CREDENTIALS: bool = True
-    
+
     # Storage
-    S3_ENDPOINT: str = os.getenv("S3_ENDPOINT", "")
-    S3_ACCESS_KEY: str = os.getenv("S3_ACCESS_KEY", "")
-    S3_SECRET_KEY: str = os.getenv("S3_SECRET_KEY", "")
-    S3_BUCKET: str = os.getenv("S3_BUCKET", "travellito")
-    S3_REGION: str = os.getenv("S3_REGION", "us-east-1")
-    S3_SECURE: bool = os.getenv("S3_SECURE", "false").lower() == "true"
-    
+    S3_ENDPOINT: str = field(default_factory=_env_str("S3_ENDPOINT"))
+    S3_ACCESS_KEY: str = field(default_factory=_env_str("S3_ACCESS_KEY"))
+    S3_SECRET_KEY: str = field(default_factory=_env_str("S3_SECRET_KEY"))
+    S3_BUCKET: str = field(default_factory=_env_str("S3_BUCKET", "travellito"))
+    S3_REGION: str = field(default_factory=_env_str("S3_REGION", "us-east-1"))
+    S3_SECURE: bool = field(default_factory=_env_bool("S3_SECURE"))
+
     # Telegram Bot
-    BOT_ALIAS: str = os.getenv("BOT_ALIAS", "TravellitoBot")
-    BOT_TOKEN: str = os.getenv("BOT_TOKEN", "")
-    WEBAPP_URL: str = os.getenv("WEBAPP_URL", "")
-    
-    # Rate Limiting
-    RATE_LIMIT_DEFAULT: str = "100/minute"
-    
+    BOT_ALIAS: str = field(default_factory=_env_str("BOT_ALIAS", "TravellitoBot"))
+    BOT_TOKEN: str = field(default_factory=_env_str("BOT_TOKEN"))
+    WEBAPP_URL: str = field(default_factory=_env_str("WEBAPP_URL"))
+
+    # Templates
+    JINJA_CACHE_DIR: str = field(default_factory=_env_str("JINJA_CACHE_DIR", "/tmp/jinja-cache"))
+    TEMPLATES_AUTO_RELOAD: bool = field(default_factory=_env_bool("TEMPLATES_AUTO_RELOAD"))
+
+    # Rate Limiting (shared storage so counters hold across uvicorn workers)
+    RATE_LIMIT_DEFAULT: str = field(default_factory=_env_str("RATE_LIMIT_DEFAULT", "100/minute"))
+    RATE_LIMIT_STORAGE_URI: str = field(default_factory=_env_str("RATE_LIMIT_STORAGE_URI", "memory://"))
+    RATE_LIMIT_STRATEGY: str = field(default_factory=_env_str("RATE_LIMIT_STRATEGY", "moving-window"))
+
     # Business Rules
     DEFAULT_MAX_COMMISSION: float = 10.0
     DEFAULT_FREE_CANCELLATION_HOURS: int = 24
-    
+
     # Yandex Metrica
-    METRIKA_COUNTER: str = os.getenv("METRIKA_COUNTER", "")
-    METRIKA_MP_TOKEN: str = os.getenv("METRIKA_MP_TOKEN", "")
-    
-    def __init__(self):
+    METRIKA_COUNTER: str = field(default_factory=_env_str("METRIKA_COUNTER"))
+    METRIKA_MP_TOKEN: str = field(default_factory=_env_str("METRIKA_MP_TOKEN"))
+
+    def __post_init__(self):
         self._validate()
         self._parse_cors_origins()
-    
+
     def _validate(self):
         """Validate required settings"""
         if not self.SECRET_KEY:
             raise ValueError("SECRET_KEY environment variable must be set")
         if not self.DB_DSN:
             raise ValueError("DB_DSN environment variable must be set")
-    
+
     def _parse_cors_origins(self):
         """Parse CORS origins from environment"""
         raw_origins = os.getenv("CORS_ALLOW_ORIGINS") or os.getenv("WEBAPP_URL", "*")
-        
+
+        # Instance is frozen, so derived fields are set via object.__setattr__
         if raw_origins.strip() == "*":
-            self.CORS_ALLOW_ORIGINS = ["*"]
-            self.CORS_ALLOW_CREDENTIALS = False  # Security: wildcard forbids credentials
+            object.__setattr__(self, "CORS_ALLOW_ORIGINS", frozenset({"*"}))
+            object.__setattr__(self, "CORS_ALLOW_CREDENTIALS", False)  # Security: wildcard forbids credentials
         else:
-            self.CORS_ALLOW_ORIGINS = [o.strip() for o in raw_origins.split(",") if o.strip()]
-            self.CORS_ALLOW_CREDENTIALS = True
+            object.__setattr__(self, "CORS_ALLOW_ORIGINS", frozenset(o.strip() for o in raw_origins.split(",") if o.strip()))
+            object.__setattr__(self, "CORS_ALLOW_CREDENTIALS", True)
 
 
 @lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance"""
-    return Settings() 
\ No newline at end of file
+    return Settings()
@@ -2,10 +2,9 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure import get_session
+from app.infrastructure.database import get_session, get_writable_session
 
-import os
-
-# Type alias for dependency injection
+# Type aliases for dependency injection (single engine lives in infrastructure.database)
+# SessionDep does not commit; mutating routes either commit explicitly or use WritableSessionDep
 SessionDep = Annotated[AsyncSession, Depends(get_session)] 
-DB_DSN = os.getenv("DB_DSN")
\ No newline at end of file
+WritableSessionDep = Annotated[AsyncSession, Depends(get_writable_session)]
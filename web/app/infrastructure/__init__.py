@@ -1,7 +1,8 @@
-from .database import engine, AsyncSessionFactory, get_session
+from .database import engine, AsyncSessionFactory, get_session, get_writable_session
 
 __all__ = [
     "engine",
     "AsyncSessionFactory",
     "get_session",
-] 
\ No newline at end of file
+    "get_writable_session",
+]
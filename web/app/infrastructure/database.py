@@ -1,17 +1,50 @@
+"""Database engine, session factory and session dependencies.
+
+The session dependencies must stay ``async def``: FastAPI runs sync
+dependencies in its threadpool, which adds a thread hop to every request.
+"""
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.core import get_settings
 
 
 settings = get_settings()
 
+if settings.DB_NULL_POOL:
+    # PgBouncer (transaction mode) does the pooling; sizing knobs do not apply
+    _pool_args = {"poolclass": NullPool}
+else:
+    _pool_args = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
 # Create async engine
 engine = create_async_engine(
     settings.DB_DSN,
     echo=settings.DB_ECHO,
-    pool_size=settings.DB_POOL_SIZE,
-    pool_pre_ping=True  # Enable connection health checks
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Connection health checks (off behind PgBouncer)
+    **_pool_args,
+    connect_args={
+        # SQLAlchemy-side and asyncpg-side prepared statement caches (0 disables both)
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # Hung queries / unreachable hosts must not hold pool slots forever
+        "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        "timeout": settings.DB_CONNECT_TIMEOUT,
+        "server_settings": {
+            "jit": "off",  # short OLTP queries never amortise JIT compilation
+            "application_name": "travellito",
+            # Detect connections silently dropped by NAT/load balancers between recycles
+            "tcp_keepalives_idle": "30",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "5",
+        },
+    },
 )
 
 # Create async session factory
@@ -25,7 +58,17 @@ AsyncSessionFactory = async_sessionmaker(
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session"""
+    """Dependency to get database session (read paths, no implicit commit)"""
+    async with AsyncSessionFactory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_writable_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get database session that commits on success"""
     async with AsyncSessionFactory() as session:
         try:
             yield session
@@ -33,5 +76,3 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close() 
\ No newline at end of file
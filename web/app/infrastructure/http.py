@@ -0,0 +1,28 @@
+"""
+Shared outbound HTTP client (Telegram Bot API and other third-party calls).
+"""
+from typing import Optional
+
+import httpx
+
+# One keep-alive pool per process; opened in the app lifespan and reused by every request
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -2,7 +2,7 @@
 Yandex Metrica integration for server-side event tracking.
 """
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 
 # Need to add httpx to requirements.txt if not already installed
 try:
@@ -15,6 +15,45 @@ from app.core.config import get_settings
 # Get settings instance
 settings = get_settings()
 
+# Shared keep-alive client; opened in the app lifespan, reused for every event
+_metrika_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_metrika_client() -> Optional["httpx.AsyncClient"]:
+    """
+    Return the shared Metrica HTTP client, creating it on first use.
+    
+    Returns None when httpx is not installed.
+    """
+    global _metrika_client
+    if httpx is None:
+        return None
+    if _metrika_client is None or _metrika_client.is_closed:
+        _metrika_client = httpx.AsyncClient(
+            base_url="https://mc.yandex.ru",
+            timeout=2.0,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+        )
+    return _metrika_client
+
+
+async def close_metrika_client() -> None:
+    """Close the shared Metrica HTTP client (called on app shutdown)."""
+    global _metrika_client
+    if _metrika_client is not None:
+        await _metrika_client.aclose()
+        _metrika_client = None
+
+
+# Bounded event queue drained by a small pool of worker tasks
+EVENT_QUEUE_MAXSIZE = 10_000
+EVENT_WORKER_COUNT = 4
+
+_event_queue: Optional[asyncio.Queue] = None
+# Strong references so worker tasks are not garbage-collected mid-flight
+_event_workers: Set[asyncio.Task] = set()
+_dropped_events = 0
+
 
 async def send_metrika_event(
     client_id: str,
@@ -54,24 +93,60 @@ async def send_metrika_event(
         params["ev"] = value
     
     try:
-        # Use httpx for async HTTP requests
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://mc.yandex.ru/collect", 
-                params=params, 
-                timeout=2.0
-            )
+        # Reuse the pooled client so events don't pay a TCP+TLS handshake each
+        await get_metrika_client().post("/collect", params=params)
     except Exception as e:
         # Silent fail - don't break app functionality if analytics fails
         print(f"Metrika error: {e}")
 
 
+async def _event_worker(queue: asyncio.Queue) -> None:
+    """Send queued events one by one until cancelled."""
+    while True:
+        client_id, action, value, extra = await queue.get()
+        try:
+            await send_metrika_event(client_id, action, value, **extra)
+        finally:
+            queue.task_done()
+
+
+def start_event_workers(count: int = EVENT_WORKER_COUNT) -> None:
+    """Create the event queue and spawn its workers on the running loop."""
+    global _event_queue
+    if _event_queue is not None:
+        return
+    _event_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+    for _ in range(count):
+        task = asyncio.create_task(_event_worker(_event_queue))
+        _event_workers.add(task)
+        task.add_done_callback(_event_workers.discard)
+
+
+async def stop_event_workers() -> None:
+    """Cancel the event workers (called on app shutdown)."""
+    global _event_queue
+    workers = list(_event_workers)
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    _event_queue = None
+
+
 def track_async_event(client_id: str, action: str, value: Optional[int] = None, **extra: Any) -> None:
     """
     Fire-and-forget wrapper for send_metrika_event.
-    Creates a background task without waiting for completion.
+    Enqueues the event for the background workers without waiting.
     
-    Use this in API handlers to avoid adding latency.
+    Use this in API handlers to avoid adding latency. When the queue is
+    full the event is dropped rather than growing memory unboundedly.
     """
-    # Create task but don't wait for it
-    asyncio.create_task(send_metrika_event(client_id, action, value, **extra)) 
\ No newline at end of file
+    global _dropped_events
+    if _event_queue is None:
+        start_event_workers()
+    try:
+        _event_queue.put_nowait((client_id, action, value, extra))
+    except asyncio.QueueFull:
+        _dropped_events += 1
+        # Log a sample only, a full queue means we are under a burst
+        if _dropped_events % 1000 == 1:
+            print(f"Metrika queue full, dropped {_dropped_events} events so far")
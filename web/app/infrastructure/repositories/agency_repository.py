@@ -23,7 +23,7 @@ class AgencyRepository(BaseRepository[Agency]):
         """Get agency with tours loaded"""
         query = (
             select(Agency)
-            .options(selectinload(Agency.tours))
+            .options(*self._loader_options(selectinload(Agency.tours)))
             .where(Agency.id == agency_id)
         )
         result = await self.session.execute(query)
@@ -31,6 +31,4 @@ class AgencyRepository(BaseRepository[Agency]):
     
     async def exists_by_name(self, name: str) -> bool:
         """Check if agency exists by name"""
-        query = select(Agency.id).where(Agency.name == name)
-        result = await self.session.execute(query)
-        return result.scalar() is not None 
\ No newline at end of file
+        return await self.exists(filters={"name": name}) 
\ No newline at end of file
@@ -1,8 +1,8 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, and_, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, joinedload
 
 from app.core import BaseRepository
 from app.models import Departure, Tour, Purchase
@@ -58,7 +58,7 @@ class DepartureRepository(BaseRepository[Departure]):
         """Get departure with tour loaded"""
         query = (
             select(Departure)
-            .options(selectinload(Departure.tour))
+            .options(joinedload(Departure.tour))  # many-to-one: one JOIN instead of a second SELECT
             .where(Departure.id == departure_id)
         )
         result = await self.session.execute(query)
@@ -76,14 +76,39 @@ class DepartureRepository(BaseRepository[Departure]):
         result = await self.session.execute(stmt)
         return result.scalar() or 0
     
+    async def get_seats_taken_bulk(self, departure_ids: List[int]) -> Dict[int, int]:
+        """Get seats taken for several departures in one grouped query"""
+        if not departure_ids:
+            return {}
+        stmt = (
+            select(Purchase.departure_id, func.coalesce(func.sum(Purchase.qty), 0))
+            .where(
+                Purchase.departure_id.in_(departure_ids),
+                Purchase.status.in_(["pending", "confirmed"])  # Only count active bookings
+            )
+            .group_by(Purchase.departure_id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return {dep_id: 0 for dep_id in departure_ids} | {dep_id: taken for dep_id, taken in rows}
+    
     async def get_available_capacity(self, departure_id: int) -> Optional[int]:
         """Get available capacity for a departure"""
-        departure = await self.get(departure_id)
-        if not departure:
+        # Capacity and seats taken in a single round-trip
+        taken = (
+            select(func.sum(Purchase.qty))
+            .where(
+                Purchase.departure_id == departure_id,
+                Purchase.status.in_(["pending", "confirmed"])  # Only count active bookings
+            )
+            .scalar_subquery()
+        )
+        stmt = select(Departure.capacity, func.coalesce(taken, 0)).where(Departure.id == departure_id)
+        row = (await self.session.execute(stmt)).first()
+        if row is None:
             return None
         
-        taken = await self.get_seats_taken(departure_id)
-        return departure.capacity - taken
+        capacity, seats_taken = row
+        return capacity - seats_taken
     
     async def get_modifiable_before_cutoff(self) -> List[Departure]:
         """Get departures that are still modifiable but past their cutoff"""
@@ -96,8 +121,64 @@ class DepartureRepository(BaseRepository[Departure]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
     
-    async def lock_for_update(self, departure_id: int) -> Optional[Departure]:
-        """Get departure with exclusive lock for updates"""
+    @staticmethod
+    def _cutoff_expr():
+        """starts_at minus the tour's free-cancellation window"""
+        return Departure.starts_at - func.make_interval(0, 0, 0, 0, Tour.free_cancellation_cutoff_h)
+    
+    async def lock_past_cutoff(self, now: datetime) -> int:
+        """Mark modifiable departures past their free-cancellation cutoff as locked
+        
+        Single set-based UPDATE ... FROM tours; returns the number of rows changed.
+        """
+        cutoff = self._cutoff_expr()
+        stmt = (
+            update(Departure)
+            .where(
+                Departure.modifiable == True,
+                Departure.tour_id == Tour.id,
+                cutoff <= now,
+            )
+            .values(modifiable=False)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+    
+    async def next_cutoff(self, now: datetime) -> Optional[datetime]:
+        """Earliest upcoming cutoff among still-modifiable departures, if any"""
+        cutoff = self._cutoff_expr()
+        stmt = (
+            select(func.min(cutoff))
+            .select_from(Departure)
+            .join(Tour, Departure.tour_id == Tour.id)
+            .where(Departure.modifiable == True, cutoff > now)
+        )
+        return await self.session.scalar(stmt)
+    
+    async def try_advisory_xact_lock(self, key: int) -> bool:
+        """Try to take a transaction-scoped advisory lock without waiting
+        
+        The lock is released when the current transaction ends.
+        """
+        return bool(await self.session.scalar(select(func.pg_try_advisory_xact_lock(key))))
+    
+    async def lock_for_update(
+        self,
+        departure_id: int,
+        *,
+        lock_timeout_ms: Optional[int] = None
+    ) -> Optional[Departure]:
+        """Get departure with exclusive lock for updates
+        
+        Waiters block in Postgres and wake as soon as the holder commits.
+        With *lock_timeout_ms* the wait is bounded for the rest of the
+        transaction and Postgres raises lock_not_available (55P03) instead.
+        """
+        if lock_timeout_ms is not None:
+            # SET does not accept bind parameters; the value is a coerced int
+            await self.session.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        
         query = (
             select(Departure)
             .where(Departure.id == departure_id)
@@ -1,8 +1,8 @@
-from typing import Optional, List, Dict, Any
-from datetime import datetime, date
-from sqlalchemy import select, and_, func
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+from datetime import datetime, date, time, timedelta
+from sqlalchemy import select, and_, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, joinedload, contains_eager
 
 from app.core import BaseRepository
 from app.models import Purchase, Departure, Tour, User, PurchaseItem
@@ -14,20 +14,31 @@ class PurchaseRepository(BaseRepository[Purchase]):
     def __init__(self, session: AsyncSession):
         super().__init__(Purchase, session)
     
+    @staticmethod
+    def _newest_first(query, *, skip: int, limit: int, after: Optional[Tuple[datetime, int]]):
+        """Order *query* by (ts, id) descending and page it by offset or keyset"""
+        if after is not None:
+            query = query.where(tuple_(Purchase.ts, Purchase.id) < tuple_(*after))
+        return query.order_by(Purchase.ts.desc(), Purchase.id.desc()).offset(skip).limit(limit)
+    
     async def get_by_departure(
         self,
         departure_id: int,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[Purchase]:
-        """Get purchases for a specific departure"""
-        query = (
-            select(Purchase)
-            .where(Purchase.departure_id == departure_id)
-            .order_by(Purchase.ts.desc())
-            .offset(skip)
-            .limit(limit)
+        """Get purchases for a specific departure
+        
+        Pass the (ts, id) of the last row seen as *after* for keyset
+        pagination instead of a growing *skip*.
+        """
+        query = self._newest_first(
+            select(Purchase).where(Purchase.departure_id == departure_id),
+            skip=skip,
+            limit=limit,
+            after=after
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -37,58 +48,97 @@ class PurchaseRepository(BaseRepository[Purchase]):
         user_id: int,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[Purchase]:
-        """Get purchases by user"""
-        query = (
-            select(Purchase)
-            .where(Purchase.user_id == user_id)
-            .order_by(Purchase.ts.desc())
-            .offset(skip)
-            .limit(limit)
+        """Get purchases by user
+        
+        Pass the (ts, id) of the last row seen as *after* for keyset
+        pagination instead of a growing *skip*.
+        """
+        query = self._newest_first(
+            select(Purchase).where(Purchase.user_id == user_id),
+            skip=skip,
+            limit=limit,
+            after=after
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
     
-    async def get_by_agency(
+    def _agency_query(
         self,
         agency_id: int,
         *,
-        from_date: Optional[date] = None,
-        to_date: Optional[date] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Purchase]:
-        """Get purchases for an agency's tours"""
+        from_date: Optional[date],
+        to_date: Optional[date],
+        skip: int,
+        limit: int
+    ):
+        """Build the agency purchases query shared by get_by_agency and stream_by_agency"""
         query = (
             select(Purchase)
             .join(Departure)
             .join(Tour)
             .where(Tour.agency_id == agency_id)
-            .options(
-                selectinload(Purchase.user),
-                selectinload(Purchase.departure).selectinload(Departure.tour),
-                selectinload(Purchase.items).selectinload(PurchaseItem.category)
-            )
+            .options(*self._loader_options(
+                # Many-to-one chain rides on the joins above; only items need a
+                # second query (one IN batch per yield_per partition)
+                contains_eager(Purchase.departure).contains_eager(Departure.tour).joinedload(Tour.city),
+                joinedload(Purchase.user),
+                selectinload(Purchase.items).joinedload(PurchaseItem.category)
+            ))
         )
         
         if from_date:
             query = query.where(Purchase.ts >= from_date)
         if to_date:
-            # Add one day to include the entire to_date
-            query = query.where(Purchase.ts < datetime.combine(to_date, datetime.min.time()).replace(day=to_date.day + 1))
+            # Half-open range up to the start of the next day includes the entire to_date
+            query = query.where(Purchase.ts < datetime.combine(to_date + timedelta(days=1), time.min))
         
-        query = query.order_by(Purchase.ts.desc()).offset(skip).limit(limit)
+        return query.order_by(Purchase.ts.desc()).offset(skip).limit(limit)
+    
+    async def get_by_agency(
+        self,
+        agency_id: int,
+        *,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Purchase]:
+        """Get purchases for an agency's tours"""
+        query = self._agency_query(
+            agency_id, from_date=from_date, to_date=to_date, skip=skip, limit=limit
+        )
         result = await self.session.execute(query)
-        return list(result.scalars().unique().all())
+        return list(result.scalars().all())
+    
+    async def stream_by_agency(
+        self,
+        agency_id: int,
+        *,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        skip: int = 0,
+        limit: int = 100,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Purchase]:
+        """Iterate an agency's purchases, fetched from a server-side cursor in batches"""
+        query = self._agency_query(
+            agency_id, from_date=from_date, to_date=to_date, skip=skip, limit=limit
+        ).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(query)
+        async for purchase in result:
+            yield purchase
     
     async def get_with_details(self, purchase_id: int) -> Optional[Purchase]:
         """Get purchase with all related data loaded"""
         query = (
             select(Purchase)
             .options(
-                selectinload(Purchase.user),
-                selectinload(Purchase.departure).selectinload(Departure.tour),
+                # Many-to-one hops are joined; the items collection stays selectin
+                joinedload(Purchase.user),
+                joinedload(Purchase.departure).joinedload(Departure.tour),
                 selectinload(Purchase.items).selectinload(PurchaseItem.category)
             )
             .where(Purchase.id == purchase_id)
@@ -142,4 +192,17 @@ class PurchaseRepository(BaseRepository[Purchase]):
             query = query.where(Purchase.status == status)
         
         result = await self.session.execute(query)
-        return result.scalar() or 0 
\ No newline at end of file
+        return result.scalar() or 0
+    
+    async def count_by_status_all(self, agency_id: int) -> Dict[str, int]:
+        """Count an agency's purchases for every status in one grouped query"""
+        query = (
+            select(Purchase.status, func.count())
+            .select_from(Purchase)
+            .join(Departure)
+            .join(Tour)
+            .where(Tour.agency_id == agency_id)
+            .group_by(Purchase.status)
+        )
+        result = await self.session.execute(query)
+        return {status: count for status, count in result.all()}
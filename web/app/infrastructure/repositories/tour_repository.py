@@ -1,10 +1,13 @@
 from typing import Optional, List, Dict, Any
-from sqlalchemy import select, and_
+from datetime import datetime
+from sqlalchemy import select, and_, or_, exists
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import BaseRepository
-from app.models import Tour, TourImage, Departure
+from app.models import (
+    Tour, TourImage, Departure, TicketCategory, TourRepetition, TourCategoryAssociation
+)
 
 
 class ITourRepository(BaseRepository[Tour]):
@@ -24,9 +27,27 @@ class ITourRepository(BaseRepository[Tour]):
         """Get tour with images loaded"""
         pass
     
+    async def get_brief_by_agency(self, agency_id: int) -> List[Any]:
+        """Get (id, title) rows for an agency's tours"""
+        pass
+    
+    async def search_summaries(
+        self,
+        *,
+        upcoming_after: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Any]:
+        """Get (id, title, price) rows for tour listings"""
+        pass
+    
     async def add_image(self, tour_id: int, image_key: str) -> TourImage:
         """Add image to tour"""
         pass
+    
+    async def add_images(self, tour_id: int, image_keys: List[str]) -> List[TourImage]:
+        """Add several images to tour in one flush"""
+        pass
 
 
 class TourRepository(ITourRepository):
@@ -59,10 +80,10 @@ class TourRepository(ITourRepository):
         query = (
             select(Tour)
             .where(Tour.agency_id == agency_id)
-            .options(
+            .options(*self._loader_options(
                 selectinload(Tour.tour_categories),
                 selectinload(Tour.repetitions),
-            )
+            ))
             .order_by(Tour.id.desc())
             .offset(skip)
             .limit(limit)
@@ -70,6 +91,16 @@ class TourRepository(ITourRepository):
         result = await self.session.execute(query)
         return list(result.scalars().all())
     
+    async def get_brief_by_agency(self, agency_id: int) -> List[Any]:
+        """Get (id, title) rows for an agency's tours without loading relationships"""
+        query = (
+            select(Tour.id, Tour.title)
+            .where(Tour.agency_id == agency_id)
+            .order_by(Tour.id.desc())
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+    
     async def get_with_images(self, tour_id: int) -> Optional[Tour]:
         """Get tour with images eagerly loaded"""
         query = (
@@ -91,6 +122,14 @@ class TourRepository(ITourRepository):
         await self.session.flush()
         return image
     
+    async def add_images(self, tour_id: int, image_keys: List[str]) -> List[TourImage]:
+        """Add several images to tour in one flush"""
+        images = [TourImage(tour_id=tour_id, key=key) for key in image_keys]
+        self.session.add_all(images)
+        # One batched INSERT instead of a flush per image
+        await self.session.flush()
+        return images
+    
     async def search(
         self,
         *,
@@ -103,7 +142,8 @@ class TourRepository(ITourRepository):
     ) -> List[Tour]:
         """Search tours with filters"""
         query = select(Tour).options(
-            selectinload(Tour.tour_categories)
+            selectinload(Tour.tour_categories),
+            selectinload(Tour.repetitions),
         )
         
         conditions = []
@@ -112,7 +152,6 @@ class TourRepository(ITourRepository):
         # If category_id is provided, we need to join with tour_category_associations
         # and filter by category_id there
         if category_id:
-            from app.models import TourCategoryAssociation
             query = (
                 query.join(TourCategoryAssociation, 
                            Tour.id == TourCategoryAssociation.tour_id)
@@ -128,4 +167,38 @@ class TourRepository(ITourRepository):
         
         query = query.order_by(Tour.id.desc()).offset(skip).limit(limit)
         result = await self.session.execute(query)
-        return list(result.scalars().all()) 
\ No newline at end of file
+        return list(result.scalars().all())
+    
+    async def search_summaries(
+        self,
+        *,
+        upcoming_after: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Any]:
+        """Get (id, title, price) rows for tour listings
+        
+        Projects only the listed columns instead of whole Tour rows; price is
+        the standard (ticket_class_id=1) category price via a scalar subquery.
+        With *upcoming_after* only tours with a departure from that moment on,
+        or with a repetition rule, are returned.
+        """
+        price = (
+            select(TicketCategory.price)
+            .where(TicketCategory.tour_id == Tour.id, TicketCategory.ticket_class_id == 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = select(Tour.id, Tour.title, price.label("price"))
+        
+        if upcoming_after is not None:
+            query = query.where(
+                or_(
+                    exists().where(Departure.tour_id == Tour.id, Departure.starts_at >= upcoming_after),
+                    exists().where(TourRepetition.tour_id == Tour.id, TourRepetition.repeat_time.isnot(None)),
+                )
+            )
+        
+        query = query.order_by(Tour.id.desc()).offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.all())
@@ -27,9 +27,7 @@ class UserRepository(BaseRepository[User]):
     
     async def exists_by_email(self, email: str) -> bool:
         """Check if user exists by email"""
-        query = select(User.id).where(User.email == email)
-        result = await self.session.execute(query)
-        return result.scalar() is not None
+        return await self.exists(filters={"email": email})
     
     async def get_with_agency(self, user_id: int) -> Optional[User]:
         """Get user with agency relationship loaded"""
@@ -0,0 +1,42 @@
+"""
+In-process TTL cache for platform settings rows (the ``settings`` table).
+
+Settings change rarely but are read on hot paths (earnings, QR rendering),
+so values are kept per process for a short TTL. Writers must call
+``invalidate_setting`` after committing a change; other workers pick the
+new value up once their entry expires.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Setting
+
+SETTINGS_TTL = 60.0  # seconds
+
+# key -> (value, expires_at on the monotonic clock); None values are cached too
+_cache: Dict[str, Tuple[Any, float]] = {}
+
+
+async def get_setting(session: AsyncSession, key: str, ttl: float = SETTINGS_TTL) -> Optional[Any]:
+    """Return the value of setting *key* (None when the row is missing)."""
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+    
+    row = await session.get(Setting, key)
+    value = row.value if row is not None else None
+    _cache[key] = (value, now + ttl)
+    return value
+
+
+def prime_setting(key: str, value: Any, ttl: float = SETTINGS_TTL) -> None:
+    """Seed the cache with a known value (e.g. at startup)."""
+    _cache[key] = (value, time.monotonic() + ttl)
+
+
+def invalidate_setting(key: str) -> None:
+    """Drop *key* from this process's cache after it was changed."""
+    _cache.pop(key, None)
@@ -0,0 +1,57 @@
+"""
+Shared Jinja2 templates for the server-rendered admin/agency/partner pages.
+
+Compiled templates are persisted in a filesystem bytecode cache so every
+uvicorn worker (and every restart) reuses them instead of re-parsing, and
+``warm_templates`` compiles the whole tree at startup so no request pays
+the first-hit cost. Pages whose output never depends on the request are
+rendered once and served from memory via ``static_page``.
+"""
+import os
+
+import jinja2
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+TEMPLATES_DIR = "templates"
+
+os.makedirs(settings.JINJA_CACHE_DIR, exist_ok=True)
+
+_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(settings.JINJA_CACHE_DIR),
+    # Skip the per-render mtime check unless templates are being edited live
+    auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+)
+
+templates = Jinja2Templates(env=_env)
+
+
+def warm_templates() -> int:
+    """Compile every template up front; returns the number loaded."""
+    names = _env.list_templates(extensions=["html"])
+    for name in names:
+        _env.get_template(name)
+    return len(names)
+
+
+_static_pages: dict[str, bytes] = {}
+
+
+def static_page(name: str, context: dict | None = None) -> HTMLResponse:
+    """Serve a page that renders identically for every request.
+
+    *context* must be constant for the life of the process; the first render
+    is kept and reused (unless templates are auto-reloading).
+    """
+    body = _static_pages.get(name)
+    if body is None:
+        body = _env.get_template(name).render(context or {}).encode()
+        if not settings.TEMPLATES_AUTO_RELOAD:
+            _static_pages[name] = body
+    return HTMLResponse(body)
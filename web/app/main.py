@@ -1,8 +1,7 @@
 """Main application entry point using clean architecture."""
 
-from fastapi import FastAPI, Request, Depends, HTTPException, status
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi import FastAPI, APIRouter, Request, Depends, HTTPException, status
+from fastapi.responses import HTMLResponse, PlainTextResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import select
@@ -10,17 +9,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
 import os
 import asyncio
-from datetime import datetime, timedelta, date
-import httpx
-from fastapi.responses import Response
+import logging
+import random
 from typing import Optional
 
+from .core import BaseError, NotFoundError, get_settings
 from .infrastructure.database import engine, AsyncSessionFactory
 from .deps import SessionDep
-from .models import Setting, Departure, Tour, Base
+from .models import Setting, Base
 from .api.v1.api import api_v1_router
-from .api.v1.middleware import exception_handler, ClientIDMiddleware, TokenRefreshMiddleware
-from .storage import client, BUCKET
+from .api.v1.routing import ORJSONRoute
+from .api.v1.endpoints.public import landlord_signup
+from .services import DepartureService
+from .services.landlord_service import LandlordService
+from .api.v1.middleware import (
+    base_error_handler, exception_handler, ClientIDMiddleware, TokenRefreshMiddleware
+)
+from .storage import bucket_exists
+from .infrastructure.http import get_http_client, close_http_client
+from .infrastructure.settings_cache import prime_setting
+from .infrastructure.templates import templates, static_page, warm_templates
+from .infrastructure.metrika import (
+    get_metrika_client, close_metrika_client, start_event_workers, stop_event_workers
+)
 from .security import role_required, current_user
 
 # Rate limiting
@@ -29,8 +40,24 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
-templates = Jinja2Templates(directory="templates")
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+settings = get_settings()
+# Moving window avoids the 2x burst a fixed window allows at its edges; with
+# a redis:// storage URI the check runs as one atomic Lua script per request.
+# If the shared storage is unreachable, fall back to per-process counters.
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=[settings.RATE_LIMIT_DEFAULT],
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,
+)
+
+CUTOFF_INTERVAL = 3600  # seconds between departure cutoff sweeps
+CUTOFF_JITTER = 300  # +/- seconds so replicas do not all sweep on the same tick
+CUTOFF_RETRY_DELAY = 60  # seconds before retrying a failed sweep
+CUTOFF_WAKE_GRACE = 1  # seconds past a departure cutoff before sweeping for it
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -40,40 +67,80 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
+    # Compile page templates before the first request hits them
+    warm_templates()
+    
     # Ensure platform default settings exist
     async with AsyncSessionFactory() as s:
         default_setting = await s.get(Setting, "default_max_commission")
         if default_setting is None:
-            s.add(Setting(key="default_max_commission", value=10))
+            default_setting = Setting(key="default_max_commission", value=10)
+            s.add(default_setting)
             await s.commit()
+        prime_setting("default_max_commission", default_setting.value)
     
     # Start periodic task to lock departures past free-cancellation cutoff
     async def _cutoff_loop():
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        # Hourly ticks skip if any worker swept within roughly an interval;
+        # cutoff wake-ups only need a sweep newer than that cutoff
+        min_interval = CUTOFF_INTERVAL - CUTOFF_JITTER
         while True:
-            async with AsyncSessionFactory() as sess:
-                now = datetime.utcnow()
-                stmt = select(Departure).join(Tour).where(Departure.modifiable == True)
-                deps = (await sess.scalars(stmt)).unique().all()
-                changed = False
-                for dep in deps:
-                    cutoff = dep.starts_at - timedelta(hours=dep.tour.free_cancellation_cutoff_h)
-                    if now >= cutoff:
-                        dep.modifiable = False
-                        changed = True
-                if changed:
-                    await sess.commit()
-            await asyncio.sleep(3600)
+            try:
+                async with AsyncSessionFactory() as sess:
+                    service = DepartureService(sess)
+                    # One set-based UPDATE instead of loading and mutating every row
+                    await service.check_and_lock_departures(min_interval)
+                    until_cutoff = await service.seconds_until_next_cutoff()
+            except Exception:
+                # Back off briefly on DB errors instead of waiting a whole interval
+                logger.exception("Departure cutoff sweep failed")
+                await asyncio.sleep(CUTOFF_RETRY_DELAY)
+                next_tick = loop.time()
+                continue
+            # Schedule against the monotonic clock so the hourly tick does not drift;
+            # jitter keeps replicas from all sweeping at the same moment
+            while next_tick <= loop.time():
+                next_tick += CUTOFF_INTERVAL
+            delay = next_tick + random.uniform(-CUTOFF_JITTER, CUTOFF_JITTER) - loop.time()
+            min_interval = CUTOFF_INTERVAL - CUTOFF_JITTER
+            if until_cutoff is not None and until_cutoff + CUTOFF_WAKE_GRACE < delay:
+                # Wake as soon as the next departure actually reaches its cutoff
+                delay = until_cutoff + CUTOFF_WAKE_GRACE
+                min_interval = CUTOFF_WAKE_GRACE
+            await asyncio.sleep(max(0.0, delay))
     
-    task = asyncio.create_task(_cutoff_loop())
+    app.state.cutoff_task = task = asyncio.create_task(_cutoff_loop())
+    
+    # Keep the health status fresh in the background so /healthz does no I/O
+    app.state.health = await _check_health()
+    
+    async def _health_loop():
+        while True:
+            await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+            app.state.health = await _check_health()
+    
+    health_task = asyncio.create_task(_health_loop())
+    
+    # Shared HTTP clients: outbound API calls and server-side analytics events
+    app.state.http = get_http_client()
+    app.state.metrika_client = get_metrika_client()
+    start_event_workers()
     
     yield
     
     # Shutdown
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for t in (task, health_task):
+        t.cancel()
+        try:
+            await asyncio.wait_for(t, timeout=5)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            pass
+    
+    await stop_event_workers()
+    await close_metrika_client()
+    await close_http_client()
 
 
 # Create FastAPI app
@@ -81,26 +148,21 @@ app = FastAPI(
     title="Travellito API",
     description="Tour booking platform API",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Parse JSON bodies with orjson on routes registered directly on the app
+app.router.route_class = ORJSONRoute
+
 # Attach rate-limiter
 app.state.limiter = limiter
 
-# CORS Configuration
-_raw_origins = os.getenv("CORS_ALLOW_ORIGINS") or os.getenv("WEBAPP_URL", "*")
-
-if _raw_origins.strip() == "*":
-    _allow_origins = ["*"]
-    _allow_credentials = False
-else:
-    _allow_origins = [o.strip() for o in _raw_origins.split(",") if o.strip()]
-    _allow_credentials = True
-
+# CORS Configuration (origins parsed once in Settings; frozenset for O(1) lookups)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=_allow_origins,
-    allow_credentials=_allow_credentials,
+    allow_origins=settings.CORS_ALLOW_ORIGINS,
+    allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"]
 )
@@ -118,7 +180,8 @@ async def ratelimit_handler(request: Request, exc: RateLimitExceeded):
 
 app.add_middleware(SlowAPIMiddleware)
 
-# Exception handling
+# Exception handling: JSON envelopes for /api/v1, plain responses elsewhere
+app.add_exception_handler(BaseError, base_error_handler)
 app.add_exception_handler(Exception, exception_handler)
 
 # Include v1 API with all endpoints
@@ -128,22 +191,36 @@ app.include_router(api_v1_router, prefix="/api/v1")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Health check
-@app.get("/healthz")
-async def healthz(sess: SessionDep):
-    """Health check endpoint."""
-    status = {"db": "ok", "s3": "ok"}
-    
-    try:
+HEALTH_PROBE_TIMEOUT = 1.0  # seconds per dependency
+HEALTH_REFRESH_INTERVAL = 15.0  # seconds between background probes
+
+
+async def _probe_db() -> None:
+    async with AsyncSessionFactory() as sess:
         await sess.scalar(select(1))
-    except Exception:
-        status["db"] = "error"
-    
-    try:
-        client.bucket_exists(BUCKET)
-    except Exception:
-        status["s3"] = "error"
-    
-    return status
+
+
+async def _probe_s3() -> None:
+    await bucket_exists()
+
+
+async def _check_health() -> dict:
+    """Probe DB and S3 concurrently, each capped by HEALTH_PROBE_TIMEOUT."""
+    db, s3 = await asyncio.gather(
+        asyncio.wait_for(_probe_db(), timeout=HEALTH_PROBE_TIMEOUT),
+        asyncio.wait_for(_probe_s3(), timeout=HEALTH_PROBE_TIMEOUT),
+        return_exceptions=True,
+    )
+    return {
+        "db": "error" if isinstance(db, BaseException) else "ok",
+        "s3": "error" if isinstance(s3, BaseException) else "ok",
+    }
+
+
+@app.get("/healthz")
+async def healthz(request: Request):
+    """Health check endpoint (last result of the background refresher)."""
+    return request.app.state.health
 
 # Root endpoint
 @app.get("/")
@@ -157,43 +234,44 @@ async def root():
 
 # Legacy HTML pages (temporary for backward compatibility)
 @app.get("/login", response_class=HTMLResponse)
-def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {
-        "request": request,
-        "TELEGRAM_BOT_ALIAS": os.getenv("BOT_ALIAS")
-    })
+async def login_page():
+    return static_page("login.html", {"TELEGRAM_BOT_ALIAS": os.getenv("BOT_ALIAS")})
+
+# Admin pages: the role check is attached once to the router, not per route
+admin_pages = APIRouter(prefix="/admin", dependencies=[Depends(role_required("admin"))])
+
+@admin_pages.get("", response_class=HTMLResponse)
+async def admin_dashboard():
+    return static_page("admin/dashboard.html")
 
-# Admin pages
-@app.get("/admin", response_class=HTMLResponse, dependencies=[Depends(role_required("admin"))])
-async def admin_dashboard(request: Request):
-    return templates.TemplateResponse("admin/dashboard.html", {"request": request})
+@admin_pages.get("/tours", response_class=HTMLResponse)
+async def admin_tours():
+    return static_page("admin/tours.html")
 
-@app.get("/admin/tours", response_class=HTMLResponse, dependencies=[Depends(role_required("admin"))])
-async def admin_tours(request: Request):
-    return templates.TemplateResponse("admin/tours.html", {"request": request})
+@admin_pages.get("/agencies", response_class=HTMLResponse)
+async def admin_agencies():
+    return static_page("admin/agencies.html")
 
-@app.get("/admin/agencies", response_class=HTMLResponse, dependencies=[Depends(role_required("admin"))])
-async def admin_agencies(request: Request):
-    return templates.TemplateResponse("admin/agencies.html", {"request": request})
+@admin_pages.get("/landlords", response_class=HTMLResponse)
+async def admin_landlords():
+    return static_page("admin/landlords.html")
 
-@app.get("/admin/landlords", response_class=HTMLResponse, dependencies=[Depends(role_required("admin"))])
-async def admin_landlords(request: Request):
-    return templates.TemplateResponse("admin/landlords.html", {"request": request})
+@admin_pages.get("/settings", response_class=HTMLResponse)
+async def admin_settings():
+    return static_page("admin/settings.html")
 
-@app.get("/admin/settings", response_class=HTMLResponse, dependencies=[Depends(role_required("admin"))])
-async def admin_settings(request: Request):
-    return templates.TemplateResponse("admin/settings.html", {"request": request})
+@admin_pages.get("/support", response_class=HTMLResponse)
+async def admin_support():
+    return static_page("admin/support.html")
 
-@app.get("/admin/support", response_class=HTMLResponse, dependencies=[Depends(role_required("admin"))])
-async def admin_support(request: Request):
-    return templates.TemplateResponse("admin/support.html", {"request": request})
+app.include_router(admin_pages)
 
 # Partner pages
-@app.get("/api/v1/landlord", response_class=HTMLResponse, dependencies=[Depends(role_required("landlord"))])
+landlord_pages = APIRouter(prefix="/api/v1/landlord", dependencies=[Depends(role_required("landlord"))])
+
+@landlord_pages.get("", response_class=HTMLResponse)
 async def landlord_dashboard(request: Request, sess: SessionDep, user=Depends(current_user)):
     """Landlord dashboard page."""
-    from app.services.landlord_service import LandlordService
-    from app.core.exceptions import NotFoundError
     
     # Get landlord data via service (following clean architecture)
     try:
@@ -216,7 +294,7 @@ async def landlord_dashboard(request: Request, sess: SessionDep, user=Depends(cu
             "apartments": []
         })
 
-@app.get("/api/v1/landlord/apartments/new", response_class=HTMLResponse, dependencies=[Depends(role_required("landlord"))])
+@landlord_pages.get("/apartments/new", response_class=HTMLResponse)
 async def new_apartment_form(request: Request, sess: SessionDep, user=Depends(current_user)):
     """Add new apartment page."""
     # Get landlord data for notification banner
@@ -227,44 +305,45 @@ async def new_apartment_form(request: Request, sess: SessionDep, user=Depends(cu
         "landlord": landlord
     })
 
-@app.get("/signup/landlord", response_class=HTMLResponse)
-def landlord_signup_page(request: Request):
-    return templates.TemplateResponse("landlord_signup.html", {"request": request})
+app.include_router(landlord_pages)
 
-@app.post("/signup/landlord")
-async def landlord_signup_redirect(request: Request):
-    """Redirect to the API endpoint for landlord signup."""
-    data = await request.json()
-    
-    # Forward the request to our API endpoint
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{request.base_url}api/v1/public/signup/landlord",
-            json=data
-        )
-        
-        return Response(content=response.content, status_code=response.status_code)
+@app.get("/signup/landlord", response_class=HTMLResponse)
+async def landlord_signup_page():
+    return static_page("landlord_signup.html")
+
+# Legacy form URL: served by the API handler directly instead of proxying over HTTP
+app.add_api_route(
+    "/signup/landlord",
+    landlord_signup,
+    methods=["POST"],
+    status_code=status.HTTP_201_CREATED,
+    include_in_schema=False,
+)
 
 # Agency pages
-@app.get("/agency", response_class=HTMLResponse, dependencies=[Depends(role_required("agency"))])
-async def agency_dashboard(request: Request):
-    return templates.TemplateResponse("agency/dashboard.html", {"request": request})
+agency_pages = APIRouter(prefix="/agency", dependencies=[Depends(role_required("agency"))])
 
-@app.get("/agency/tours", response_class=HTMLResponse, dependencies=[Depends(role_required("agency"))])
-async def agency_tours_page(request: Request):
-    return templates.TemplateResponse("agency/tours.html", {"request": request})
+@agency_pages.get("", response_class=HTMLResponse)
+async def agency_dashboard():
+    return static_page("agency/dashboard.html")
 
-@app.get("/agency/managers", response_class=HTMLResponse, dependencies=[Depends(role_required("agency"))])
-async def agency_managers_page(request: Request):
-    return templates.TemplateResponse("agency/managers.html", {"request": request})
+@agency_pages.get("/tours", response_class=HTMLResponse)
+async def agency_tours_page():
+    return static_page("agency/tours.html")
 
-@app.get("/agency/bookings", response_class=HTMLResponse, dependencies=[Depends(role_required("agency"))])
-async def agency_bookings_page(request: Request):
-    return templates.TemplateResponse("agency/bookings.html", {"request": request})
+@agency_pages.get("/managers", response_class=HTMLResponse)
+async def agency_managers_page():
+    return static_page("agency/managers.html")
 
-@app.get("/agency/departures", response_class=HTMLResponse, dependencies=[Depends(role_required("agency"))])
-async def agency_departures_page(request: Request):
-    return templates.TemplateResponse("agency/departures.html", {"request": request})
+@agency_pages.get("/bookings", response_class=HTMLResponse)
+async def agency_bookings_page():
+    return static_page("agency/bookings.html")
+
+@agency_pages.get("/departures", response_class=HTMLResponse)
+async def agency_departures_page():
+    return static_page("agency/departures.html")
+
+app.include_router(agency_pages)
 
 # Add this route for timezone testing
 @app.get("/timezone-test", response_class=HTMLResponse)
@@ -287,8 +366,6 @@ async def get_landlord_data(user: dict, sess: AsyncSession):
         return None
         
     try:
-        from app.services.landlord_service import LandlordService
-        
         user_id = int(user["sub"])
         service = LandlordService(sess)
         landlord = await service.get_landlord_by_user_id(user_id)
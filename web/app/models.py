@@ -1,6 +1,6 @@
 from sqlalchemy import (
     String, BigInteger, Integer, ForeignKey, Numeric, DateTime,
-    func, select, UniqueConstraint, JSON, Index, Boolean, Time, Table
+    func, select, text, UniqueConstraint, JSON, Index, Boolean, Time, Table
 )
 from sqlalchemy.orm import mapped_column, relationship, DeclarativeBase
 from .roles import Role
@@ -156,6 +156,14 @@ class Departure(Base):
 
     tour        = relationship("Tour")
 
+    # Partial index for the cutoff job: only still-modifiable departures are scanned
+    __table_args__ = (
+        Index(
+            "ix_departure_modifiable_starts_at", "starts_at",
+            postgresql_where=text("modifiable"),
+        ),
+    )
+
 # ---------- Landlord chosen commission per Tour ----------
 class LandlordCommission(Base):
     __tablename__ = "landlord_commissions"
@@ -201,6 +209,11 @@ class Purchase(Base):
     # Speed up look-ups of bookings for a departure (cancellation window job, capacity checks)
     __table_args__ = (
         Index("ix_purchase_departure_ts", "departure_id", "ts"),
+        # Keyset pagination of a user's bookings by (ts, id)
+        Index("ix_purchase_user_ts_id", "user_id", "ts", "id"),
+        # Landlord earnings / dashboard aggregates over recent purchases
+        Index("ix_purchase_landlord_ts", "landlord_id", ts.desc()),
+        Index("ix_purchase_apartment_ts", "apartment_id", ts.desc()),
     )
 
 # ---------- Ticket categories (adult / child / student etc.) ------------
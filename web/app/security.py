@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 import time
-from typing import Annotated, Callable, Iterable
+from typing import Annotated, Awaitable, Callable, Iterable
 
 from fastapi import Depends, HTTPException, Request, status, Header
 from jose import JWTError, jwt
@@ -66,8 +66,21 @@ def create_token(
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Verified claims are reused for a short while so repeat requests carrying the
+# same token skip the HMAC check and JSON parse. Entries never outlive "exp".
+TOKEN_CACHE_TTL = 60  # seconds
+TOKEN_CACHE_MAX = 10_000
+
+_token_cache: dict[str, tuple[float, dict]] = {}
+
+
 def decode_token(token: str) -> dict:
     """Verify *token* and return its payload."""
+    cached = _token_cache.get(token)
+    if cached and cached[0] > time.monotonic():
+        # Copy so callers cannot mutate the shared claims
+        return dict(cached[1])
+    
     try:
         # Ensure SECRET_KEY is not None before decoding
         if SECRET_KEY is None:
@@ -76,7 +89,16 @@ def decode_token(token: str) -> dict:
     except JWTError as exc:
         print(exc)
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token") from exc
-    return payload
+    
+    ttl = TOKEN_CACHE_TTL
+    if "exp" in payload:
+        ttl = min(ttl, int(payload["exp"]) - _now())
+    if ttl > 0:
+        if len(_token_cache) >= TOKEN_CACHE_MAX:
+            # Evict the oldest entry (dicts keep insertion order)
+            _token_cache.pop(next(iter(_token_cache)))
+        _token_cache[token] = (time.monotonic() + ttl, payload)
+    return dict(payload)
 
 
 # ---------------------------------------------------------------------------
@@ -116,7 +138,7 @@ def _to_role_str(value: str | Role) -> str:
     return str(value)
 
 
-def role_required(*allowed: str | Role) -> Callable[[dict], dict]:
+def role_required(*allowed: str | Role) -> Callable[[dict], Awaitable[dict]]:
     """Return a dependency that checks *current_user* role is within *allowed*.
 
     Usage:
@@ -130,8 +152,8 @@ def role_required(*allowed: str | Role) -> Callable[[dict], dict]:
     # Normalise to strings
     allowed_set = {_to_role_str(a) for a in allowed}
 
-    # Define the dependency as a non-async function to fix the type error
-    def _dep(user: Annotated[dict, Depends(current_user)]) -> dict:
+    # Native coroutine so FastAPI does not dispatch the check to the threadpool
+    async def _dep(user: Annotated[dict, Depends(current_user)]) -> dict:
         role: str | None = user.get("role")
         if role not in allowed_set:
             raise HTTPException(status.HTTP_403_FORBIDDEN, "Forbidden")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from decimal import Decimal
 from typing import Dict, Any, List
 from secrets import token_hex
@@ -12,9 +14,16 @@ from ..core.base import BaseService
 from ..core.exceptions import NotFoundError, ConflictError
 from ..models import Agency, Landlord, Tour, Departure, Purchase, ApiKey, User, Setting
 from ..infrastructure.repositories import UserRepository, TourRepository
+from ..infrastructure.settings_cache import get_setting, invalidate_setting
 from .auth_service import AuthService
 
 
+METRICS_CACHE_TTL = 30.0  # seconds
+
+_metrics_cache: Dict[str, Any] = {"ts": 0.0, "val": None}
+_metrics_lock = asyncio.Lock()
+
+
 class AdminService(BaseService):
     """Service for admin operations."""
 
@@ -59,28 +68,45 @@ class AdminService(BaseService):
             - tickets_sold: Total tickets sold
             - sales_amount: Total sales amount
         """
-        agencies = await self.session.scalar(select(func.count()).select_from(Agency)) or 0
-        landlords = await self.session.scalar(select(func.count()).select_from(Landlord)) or 0
-        tours = await self.session.scalar(select(func.count()).select_from(Tour)) or 0
-        departures = await self.session.scalar(select(func.count()).select_from(Departure)) or 0
-        bookings = await self.session.scalar(select(func.count()).select_from(Purchase)) or 0
+        # Dashboard polling within the TTL shares one result per worker
+        if time.monotonic() - _metrics_cache["ts"] < METRICS_CACHE_TTL:
+            return _metrics_cache["val"]
         
-        tickets_sold = await self.session.scalar(
-            select(func.coalesce(func.sum(Purchase.qty), 0))
-        ) or 0
+        async with _metrics_lock:
+            if time.monotonic() - _metrics_cache["ts"] >= METRICS_CACHE_TTL:
+                _metrics_cache["val"] = await self._compute_platform_metrics()
+                _metrics_cache["ts"] = time.monotonic()
+        return _metrics_cache["val"]
+    
+    async def _compute_platform_metrics(self) -> Dict[str, Any]:
+        """Collect all platform counters in a single round-trip"""
+        def _count(model):
+            return select(func.count()).select_from(model).scalar_subquery()
         
-        sales_amount_raw = await self.session.scalar(
-            select(func.coalesce(func.sum(Purchase.amount), 0))
-        ) or 0
+        purchases = select(
+            func.count().label("bookings"),
+            func.coalesce(func.sum(Purchase.qty), 0).label("tickets_sold"),
+            func.coalesce(func.sum(Purchase.amount), 0).label("sales_amount"),
+        ).subquery()
+        stmt = select(
+            _count(Agency).label("agencies"),
+            _count(Landlord).label("landlords"),
+            _count(Tour).label("tours"),
+            _count(Departure).label("departures"),
+            purchases.c.bookings,
+            purchases.c.tickets_sold,
+            purchases.c.sales_amount,
+        )
+        row = (await self.session.execute(stmt)).one()
 
         return {
-            "agencies": agencies,
-            "landlords": landlords,
-            "tours": tours,
-            "departures": departures,
-            "bookings": bookings,
-            "tickets_sold": tickets_sold,
-            "sales_amount": Decimal(sales_amount_raw).quantize(Decimal("0.01")),
+            "agencies": row.agencies,
+            "landlords": row.landlords,
+            "tours": row.tours,
+            "departures": row.departures,
+            "bookings": row.bookings,
+            "tickets_sold": row.tickets_sold,
+            "sales_amount": Decimal(row.sales_amount).quantize(Decimal("0.01")),
         }
 
     # API Key Management
@@ -150,9 +176,8 @@ class AdminService(BaseService):
             Dictionary of settings
         """
         # Get default max commission setting
-        stmt = select(Setting).where(Setting.key == "default_max_commission")
-        result = await self.session.scalar(stmt)
-        default_max_commission = float(result.value) if result else 15.0  # Default value
+        value = await get_setting(self.session, "default_max_commission")
+        default_max_commission = float(value) if value is not None else 15.0  # Default value
         
         return {
             "default_max_commission": default_max_commission
@@ -197,6 +222,7 @@ class AdminService(BaseService):
             self.session.add(setting)
             
         await self.session.commit()
+        invalidate_setting(key)
     
     # QR Template settings
     async def get_qr_template_settings(self) -> Dict[str, Any]:
@@ -209,30 +235,20 @@ class AdminService(BaseService):
         settings = {}
         
         # Get template URL
-        template_url = await self.session.scalar(
-            select(Setting).where(Setting.key == "qr_template_url")
-        )
+        template_url = await get_setting(self.session, "qr_template_url")
         if template_url:
-            settings["template_url"] = template_url.value
+            settings["template_url"] = template_url
             
             # Get position and size settings
-            pos_x = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_pos_x")
-            )
-            pos_y = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_pos_y")
-            )
-            width = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_width")
-            )
-            height = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_height")
-            )
+            pos_x = await get_setting(self.session, "qr_template_pos_x")
+            pos_y = await get_setting(self.session, "qr_template_pos_y")
+            width = await get_setting(self.session, "qr_template_width")
+            height = await get_setting(self.session, "qr_template_height")
             
-            settings["position_x"] = int(pos_x.value) if pos_x else 50
-            settings["position_y"] = int(pos_y.value) if pos_y else 50
-            settings["width"] = int(width.value) if width else 200
-            settings["height"] = int(height.value) if height else 200
+            settings["position_x"] = int(pos_x) if pos_x is not None else 50
+            settings["position_y"] = int(pos_y) if pos_y is not None else 50
+            settings["width"] = int(width) if width is not None else 200
+            settings["height"] = int(height) if height is not None else 200
             
         return settings if settings else None
     
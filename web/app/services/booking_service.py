@@ -1,7 +1,7 @@
 from datetime import date, datetime, timedelta
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import joinedload
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 from app.core import BaseError
 from app.core import BaseService, NotFoundError, ValidationError, ConflictError, BusinessLogicError
@@ -9,6 +9,15 @@ from app.models import Purchase, User, Departure, Tour, PurchaseItem, TicketCate
 from app.infrastructure.repositories.purchase_repository import PurchaseRepository
 from app.infrastructure.metrika import track_async_event
 
+EXPORT_LIMIT = 1000  # Reasonable limit for exports
+
+# Column order of the bookings CSV export (categories are too complex for CSV)
+EXPORT_CSV_FIELDS = [
+    "booking_id", "booking_date", "tour_title", "departure_date",
+    "customer_name", "customer_phone", "total_quantity", "total_amount",
+    "status", "viewed", "timezone_offset_min", "commission_percent", "commission_amount",
+]
+
 
 class BookingService:
     def __init__(self, session):
@@ -84,6 +93,24 @@ class BookingService:
         
         return updated_booking
 
+    async def iter_export_bookings(
+        self,
+        agency_id: int,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        limit: int = EXPORT_LIMIT
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield export rows one by one as purchases stream from the database"""
+        bookings = self.repository.stream_by_agency(
+            agency_id,
+            from_date=from_date,
+            to_date=to_date,
+            skip=0,
+            limit=limit
+        )
+        async for booking in bookings:
+            yield self._export_row(booking)
+    
     async def export_bookings(
         self, 
         agency_id: int, 
@@ -92,52 +119,51 @@ class BookingService:
         format: str = "json"
     ) -> List[Dict[str, Any]]:
         """Export bookings in specified format"""
+        return [
+            row async for row in self.iter_export_bookings(agency_id, from_date, to_date)
+        ]
+    
+    @staticmethod
+    def _export_row(booking: Purchase) -> Dict[str, Any]:
+        """Map a purchase (with user, departure.tour.city and items loaded) to an export row"""
+        # Build category breakdown
+        categories = [
+            {
+                "name": item.category.name,
+                "quantity": item.qty,
+                "amount": float(item.amount)
+            }
+            for item in booking.items
+        ]
+        tour = booking.departure.tour
         
-        # Get bookings
-        bookings = await self.get_agency_bookings(
-            agency_id,
-            from_date=from_date,
-            to_date=to_date,
-            skip=0,
-            limit=1000  # Reasonable limit for exports
-        )
-        
-        # Format data for export
-        export_data = []
-        for booking in bookings:
-            # Build category breakdown
-            categories = []
-            for item in booking.items:
-                categories.append({
-                    "name": item.category.name,
-                    "quantity": item.qty,
-                    "amount": float(item.amount)
-                })
-            
-            export_data.append({
-                "booking_id": booking.id,
-                "booking_date": booking.ts.isoformat(),
-                "tour_title": booking.departure.tour.title,
-                "departure_date": booking.departure.starts_at.isoformat(),
-                "customer_name": f"{booking.user.first or ''} {booking.user.last or ''}".strip() or "Unknown",
-                "customer_phone": booking.user.phone or "",
-                "total_quantity": booking.qty,
-                "total_amount": float(booking.amount),
-                "status": booking.status,
-                "viewed": booking.viewed,
-                "categories": categories
-            })
-        
-        return export_data
+        return {
+            "booking_id": booking.id,
+            "booking_date": booking.ts.isoformat(),
+            "tour_title": tour.title,
+            "departure_date": booking.departure.starts_at.isoformat(),
+            "customer_name": f"{booking.user.first or ''} {booking.user.last or ''}".strip() or "Unknown",
+            "customer_phone": booking.user.phone or "",
+            "total_quantity": booking.qty,
+            "total_amount": float(booking.amount),
+            "status": booking.status,
+            "viewed": booking.viewed,
+            "categories": categories,
+            "timezone_offset_min": (tour.city.timezone_offset_min or 0) if tour.city else 0,
+            # Commission is not tracked per agency booking yet
+            "commission_percent": 0.0,
+            "commission_amount": 0.0,
+        }
 
     async def get_booking_metrics(self, agency_id: int) -> Dict[str, Any]:
         """Get booking metrics for agency dashboard"""
         
-        # Count bookings by status
-        pending_count = await self.repository.count_by_status(agency_id, "pending")
-        confirmed_count = await self.repository.count_by_status(agency_id, "confirmed")
-        rejected_count = await self.repository.count_by_status(agency_id, "rejected")
-        cancelled_count = await self.repository.count_by_status(agency_id, "cancelled")
+        # Count bookings by status in a single grouped query
+        counts = await self.repository.count_by_status_all(agency_id)
+        pending_count = counts.get("pending", 0)
+        confirmed_count = counts.get("confirmed", 0)
+        rejected_count = counts.get("rejected", 0)
+        cancelled_count = counts.get("cancelled", 0)
         total_count = pending_count + confirmed_count + rejected_count + cancelled_count
         
         return {
@@ -8,11 +8,11 @@ from typing import List, Dict, Any, Sequence
 from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 
 from ..core.base import BaseService
 from ..core.exceptions import NotFoundError, ValidationError, AuthorizationError
 from ..models import Purchase, User, Departure, Tour
+from ..infrastructure.http import get_http_client
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 if not BOT_TOKEN:
@@ -137,28 +137,28 @@ class BroadcastService(BaseService):
         
         api = f"https://api.telegram.org/bot{self.bot_token}"
         
-        async with httpx.AsyncClient() as client:
-            rate_limit = 25  # msgs per second (Telegram limit 30)
-            
-            async def _send(chat_id: int):
-                if text:
-                    await client.post(
-                        f"{api}/sendMessage",
-                        json={"chat_id": chat_id, "text": text}
-                    )
-                if photo_url:
-                    await client.post(
-                        f"{api}/sendPhoto",
-                        json={"chat_id": chat_id, "photo": photo_url}
-                    )
-                if document_url:
-                    await client.post(
-                        f"{api}/sendDocument",
-                        json={"chat_id": chat_id, "document": document_url}
-                    )
-            
-            # Send sequentially obeying rate-limit
-            for i, cid in enumerate(chat_ids):
-                await _send(cid)
-                if (i + 1) % rate_limit == 0:
-                    await asyncio.sleep(1) 
\ No newline at end of file
+        client = get_http_client()
+        rate_limit = 25  # msgs per second (Telegram limit 30)
+        
+        async def _send(chat_id: int):
+            if text:
+                await client.post(
+                    f"{api}/sendMessage",
+                    json={"chat_id": chat_id, "text": text}
+                )
+            if photo_url:
+                await client.post(
+                    f"{api}/sendPhoto",
+                    json={"chat_id": chat_id, "photo": photo_url}
+                )
+            if document_url:
+                await client.post(
+                    f"{api}/sendDocument",
+                    json={"chat_id": chat_id, "document": document_url}
+                )
+        
+        # Send sequentially obeying rate-limit
+        for i, cid in enumerate(chat_ids):
+            await _send(cid)
+            if (i + 1) % rate_limit == 0:
+                await asyncio.sleep(1) 
\ No newline at end of file
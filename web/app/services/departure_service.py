@@ -1,9 +1,17 @@
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 
 from app.core import BaseService, NotFoundError, ValidationError, ConflictError, BusinessLogicError
 from app.infrastructure.repositories import DepartureRepository, TourRepository
-from app.models import Departure, Tour
+from app.models import Departure, Tour, Setting
+
+
+# Advisory lock key serialising the cutoff sweep across uvicorn workers.
+# The lock only stops overlapping sweeps; duplicate hourly runs are skipped
+# via the last-sweep timestamp below, which is read and written under it.
+CUTOFF_SWEEP_LOCK_KEY = 0x7472_0001
+# Settings row holding when any worker last ran the sweep (unix seconds)
+CUTOFF_LAST_SWEEP_KEY = "departure_cutoff_last_sweep"
 
 
 class DepartureService(BaseService):
@@ -136,25 +144,40 @@ class DepartureService(BaseService):
             limit=limit
         )
     
-    async def check_and_lock_departures(self) -> int:
-        """Check and lock departures past their free cancellation cutoff"""
+    async def check_and_lock_departures(self, min_interval: float = 0) -> int:
+        """Check and lock departures past their free cancellation cutoff
         
-        now = datetime.utcnow()
-        departures = await self.departure_repo.get_modifiable_before_cutoff()
+        Skipped when any worker already swept within the last *min_interval* seconds.
+        """
         
-        locked_count = 0
-        for departure in departures:
-            tour = departure.tour
-            cutoff = departure.starts_at - timedelta(hours=tour.free_cancellation_cutoff_h)
-            
-            if now >= cutoff:
-                await self.departure_repo.update(
-                    id=departure.id,
-                    obj_in={"modifiable": False}
-                )
-                locked_count += 1
+        # One sweep at a time; a worker that loses the race skips this round
+        if not await self.departure_repo.try_advisory_xact_lock(CUTOFF_SWEEP_LOCK_KEY):
+            return 0
         
-        if locked_count > 0:
+        now_utc = datetime.now(timezone.utc)
+        last_sweep = await self.session.get(Setting, CUTOFF_LAST_SWEEP_KEY)
+        if last_sweep is not None and now_utc.timestamp() - float(last_sweep.value) < min_interval:
+            # Another worker already did this round; commit to release the lock
             await self.session.commit()
+            return 0
         
-        return locked_count 
\ No newline at end of file
+        # starts_at is a naive UTC column, so compare against naive UTC
+        locked_count = await self.departure_repo.lock_past_cutoff(now_utc.replace(tzinfo=None))
+        
+        if last_sweep is None:
+            self.session.add(Setting(key=CUTOFF_LAST_SWEEP_KEY, value=now_utc.timestamp()))
+        else:
+            last_sweep.value = now_utc.timestamp()
+        
+        # Commit even when nothing changed so the advisory lock is released
+        await self.session.commit()
+        
+        return locked_count
+    
+    async def seconds_until_next_cutoff(self) -> Optional[float]:
+        """Seconds until the next modifiable departure reaches its cutoff, if any"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        next_cutoff = await self.departure_repo.next_cutoff(now)
+        if next_cutoff is None:
+            return None
+        return (next_cutoff - now).total_seconds()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List, Dict, Any
@@ -12,9 +13,11 @@ from ..core.base import BaseService
 from ..core.exceptions import NotFoundError, ValidationError
 from ..models import (
     Apartment, Landlord, Purchase, Tour, Departure, LandlordCommission,
-    TicketCategory, Referral, Setting
+    TicketCategory, Referral
 )
+from ..infrastructure.database import AsyncSessionFactory
 from ..infrastructure.repositories import UserRepository, TourRepository
+from ..infrastructure.settings_cache import get_setting
 
 
 class LandlordService(BaseService):
@@ -161,8 +164,6 @@ class LandlordService(BaseService):
         Raises:
             NotFoundError: If landlord not found
         """
-        from datetime import datetime, timedelta
-        
         # Get landlord data
         stmt = select(Landlord).where(Landlord.user_id == user_id)
         landlord = await self.session.scalar(stmt)
@@ -170,65 +171,14 @@ class LandlordService(BaseService):
         if not landlord:
             raise NotFoundError("Landlord not found")
         
-        # Get apartments
-        apartments = await self.list_apartments(landlord.id)
-        
-        # Get apartment IDs for this landlord
-        apartment_ids = [apt.id for apt in apartments]
-        
-        if not apartment_ids:
-            # No apartments, return zero metrics
-            metrics = {
-                "total_qty": 0,
-                "total_amount": "0",
-                "last_qty": 0,
-                "last_amount": "0"
-            }
-            return {
-                "landlord": landlord,
-                "apartments": apartments,
-                "metrics": metrics
-            }
-        
-        # Calculate metrics from purchases with apartment_id referrals
-        # Get all confirmed purchases with apartment_id in the landlord's apartments
-        stmt_all = (
-            select(
-                func.count(Purchase.id).label("count"),
-                func.sum(Purchase.qty).label("qty"),
-                func.ceil(func.sum(Purchase.amount * Tour.max_commission_pct / 100)).label("amount")
+        # One session cannot run two statements at once, so the aggregate
+        # goes through a second short-lived session alongside the list
+        async with AsyncSessionFactory() as metrics_session:
+            apartments, totals = await asyncio.gather(
+                self.list_apartments(landlord.id),
+                self._referral_totals(metrics_session, landlord.id),
             )
-            .join(Departure, Purchase.departure_id == Departure.id)
-            .join(Tour, Departure.tour_id == Tour.id)
-            .where(
-                Purchase.apartment_id.in_(apartment_ids),
-                Purchase.status == "confirmed"
-            )
-        )
-        
-        # Get purchases from the last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        stmt_recent = (
-            select(
-                func.count(Purchase.id).label("count"),
-                func.sum(Purchase.qty).label("qty"),
-                func.ceil(func.sum(Purchase.amount * Tour.max_commission_pct / 100)).label("amount")
-            )
-            .join(Departure, Purchase.departure_id == Departure.id)
-            .join(Tour, Departure.tour_id == Tour.id)
-            .where(
-                Purchase.apartment_id.in_(apartment_ids),
-                Purchase.status == "confirmed",
-                Purchase.ts >= thirty_days_ago
-            )
-        )
-        
-        # Execute both queries
-        result_all = await self.session.execute(stmt_all)
-        all_count, all_qty, all_amount = result_all.one()
-        
-        result_recent = await self.session.execute(stmt_recent)
-        recent_count, recent_qty, recent_amount = result_recent.one()
+        all_qty, all_amount, recent_qty, recent_amount = totals
         
         # Handle None values
         all_qty = int(all_qty or 0)
@@ -249,43 +199,54 @@ class LandlordService(BaseService):
             "metrics": metrics
         }
 
+    @staticmethod
+    async def _referral_totals(session: AsyncSession, landlord_id: int):
+        """All-time and last-30-days (qty, commission) of confirmed purchases
+        referred via the landlord's apartments, computed in a single scan"""
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        is_recent = Purchase.ts >= thirty_days_ago
+        commission = Purchase.amount * Tour.max_commission_pct / 100
+        landlord_apartments = select(Apartment.id).where(Apartment.landlord_id == landlord_id)
+        stmt = (
+            select(
+                func.sum(Purchase.qty).label("qty"),
+                func.ceil(func.sum(commission)).label("amount"),
+                func.sum(Purchase.qty).filter(is_recent).label("recent_qty"),
+                func.ceil(func.sum(commission).filter(is_recent)).label("recent_amount"),
+            )
+            .join(Departure, Purchase.departure_id == Departure.id)
+            .join(Tour, Departure.tour_id == Tour.id)
+            .where(
+                Purchase.apartment_id.in_(landlord_apartments),
+                Purchase.status == "confirmed"
+            )
+        )
+        return (await session.execute(stmt)).one()
+
     async def get_qr_template_settings(self) -> dict | None:
         """Get QR template settings from admin settings.
         
         Returns:
             Dictionary with template settings or None
         """
-        from sqlalchemy import select
-        from ..models import Setting
-        
         # Get QR template settings
         settings = {}
         
         # Get template URL
-        template_url = await self.session.scalar(
-            select(Setting).where(Setting.key == "qr_template_url")
-        )
+        template_url = await get_setting(self.session, "qr_template_url")
         if template_url:
-            settings["template_url"] = template_url.value
+            settings["template_url"] = template_url
             
             # Get position and size settings
-            pos_x = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_pos_x")
-            )
-            pos_y = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_pos_y")
-            )
-            width = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_width")
-            )
-            height = await self.session.scalar(
-                select(Setting).where(Setting.key == "qr_template_height")
-            )
+            pos_x = await get_setting(self.session, "qr_template_pos_x")
+            pos_y = await get_setting(self.session, "qr_template_pos_y")
+            width = await get_setting(self.session, "qr_template_width")
+            height = await get_setting(self.session, "qr_template_height")
             
-            settings["position_x"] = int(pos_x.value) if pos_x else 50
-            settings["position_y"] = int(pos_y.value) if pos_y else 50
-            settings["width"] = int(width.value) if width else 200
-            settings["height"] = int(height.value) if height else 200
+            settings["position_x"] = int(pos_x) if pos_x is not None else 50
+            settings["position_y"] = int(pos_y) if pos_y is not None else 50
+            settings["width"] = int(width) if width is not None else 200
+            settings["height"] = int(height) if height is not None else 200
             
         return settings if settings else None
 
@@ -443,7 +404,7 @@ class LandlordService(BaseService):
         
         # Get apartment IDs for this landlord
         stmt_apartments = select(Apartment.id).where(Apartment.landlord_id == landlord_id)
-        apartment_ids = [row[0] for row in await self.session.execute(stmt_apartments)]
+        apartment_ids = (await self.session.scalars(stmt_apartments)).all()
         
         # Aggregate totals and earnings from direct referrals
         stmt_base_direct = select(
@@ -532,7 +493,7 @@ class LandlordService(BaseService):
         
         # Get apartment IDs for this landlord
         stmt_apartments = select(Apartment.id).where(Apartment.landlord_id == landlord_id)
-        apartment_ids = [row[0] for row in await self.session.execute(stmt_apartments)]
+        apartment_ids = (await self.session.scalars(stmt_apartments)).all()
         
         # Get direct referral purchases
         stmt_direct = (
@@ -572,8 +533,7 @@ class LandlordService(BaseService):
         # Union the two queries and order by timestamp
         stmt = stmt_direct.union(stmt_apt).order_by(desc(column('ts')))
 
-        comm_pct = select(Setting).where(Setting.key == "default_max_commission")
-        comm_pct_res = await self.session.scalar(comm_pct)
+        comm_pct_res = await get_setting(self.session, "default_max_commission")
 
         rows = await self.session.execute(stmt)
         
@@ -5,8 +5,9 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta, date, time
 from decimal import Decimal
-from typing import List, Dict, Any, Sequence, Optional
-from sqlalchemy import select, func, and_, or_, Time, Text
+from typing import List, Dict, Any, Mapping, Sequence, Optional
+from sqlalchemy import select, func, and_, Time, Text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,19 +15,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 logger = logging.getLogger(__name__)
 
 from ..core.base import BaseService
-from ..core.exceptions import NotFoundError, ValidationError
+from ..core.exceptions import NotFoundError, ValidationError, ConflictError
 from ..models import (
     Tour, Departure, Purchase, TicketCategory, Referral, 
     LandlordCommission, City, TourCategory, TicketClass, 
-    RepetitionType, Apartment, PurchaseItem, User
+    RepetitionType, Apartment, PurchaseItem, User, Landlord
 )
+from ..roles import Role
 from ..infrastructure.repositories import TourRepository, DepartureRepository
 from ..storage import presigned
 from .tour_filter_service import TourFilterService
+from .auth_service import AuthService
+from .notification_service import NotificationService
 
 from app.infrastructure.metrika import track_async_event
 
 HUNDRED = Decimal("100")  # module-level constant
+BOOKING_LOCK_TIMEOUT_MS = 5000  # max wait for a contended departure row
+LOCK_NOT_AVAILABLE = "55P03"  # Postgres SQLSTATE raised when lock_timeout expires
 
 
 class PublicService(BaseService):
@@ -444,8 +450,9 @@ class PublicService(BaseService):
         # Process existing departures
         existing_dates = set()
         existing_datetimes = set()
+        taken_by_dep = await self.departure_repository.get_seats_taken_bulk([dep.id for dep in deps])
         for dep in deps:
-            taken = await self.departure_repository.get_seats_taken(dep.id)
+            taken = taken_by_dep[dep.id]
             all_departures.append({
                 "id": dep.id,
                 "starts_at": dep.starts_at,
@@ -539,31 +546,30 @@ class PublicService(BaseService):
     
     # Listing Methods
     
-    async def list_cities(self) -> List[Dict[str, Any]]:
+    # Dropdown lists return keyed row mappings straight from the cursor
+    # instead of unpacking tuples into fresh dicts per row
+    
+    async def list_cities(self) -> Sequence[Mapping[str, Any]]:
         """List all cities for dropdown selection."""
         stmt = select(City.id, City.name).order_by(City.name)
-        result = await self.session.execute(stmt)
-        return [{"id": id, "name": name} for id, name in result]
+        return (await self.session.execute(stmt)).mappings().all()
     
-    async def list_tour_categories(self) -> List[Dict[str, Any]]:
+    async def list_tour_categories(self) -> Sequence[Mapping[str, Any]]:
         """List all tour categories for dropdown selection."""
         stmt = select(TourCategory.id, TourCategory.name).order_by(TourCategory.name)
-        result = await self.session.execute(stmt)
-        return [{"id": id, "name": name} for id, name in result]
+        return (await self.session.execute(stmt)).mappings().all()
     
-    async def list_ticket_classes(self) -> List[Dict[str, Any]]:
+    async def list_ticket_classes(self) -> Sequence[Mapping[str, Any]]:
         """List all ticket classes for dropdown selection."""
-        stmt = select(TicketClass.id, TicketClass.code, TicketClass.human_name).order_by(
-            TicketClass.human_name
-        )
-        result = await self.session.execute(stmt)
-        return [{"id": id, "code": code, "name": name} for id, code, name in result]
+        stmt = select(
+            TicketClass.id, TicketClass.code, TicketClass.human_name.label("name")
+        ).order_by(TicketClass.human_name)
+        return (await self.session.execute(stmt)).mappings().all()
     
-    async def list_repetition_types(self) -> List[Dict[str, Any]]:
+    async def list_repetition_types(self) -> Sequence[Mapping[str, Any]]:
         """Return all repetition types for dropdown selection."""
-        stmt = select(RepetitionType).order_by(RepetitionType.id)
-        rows = await self.session.scalars(stmt)
-        return [{"id": r.id, "name": r.name} for r in rows.all()]
+        stmt = select(RepetitionType.id, RepetitionType.name).order_by(RepetitionType.id)
+        return (await self.session.execute(stmt)).mappings().all()
     
     async def create_landlord(
         self, 
@@ -584,9 +590,6 @@ class PublicService(BaseService):
         Raises:
             ValidationError: If email already exists
         """
-        from app.services.auth_service import AuthService
-        from app.models import Landlord
-        from app.roles import Role
         
         # Create user with landlord role
         auth_service = AuthService(self.session)
@@ -611,55 +614,22 @@ class PublicService(BaseService):
     
     async def list_tours(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """List tours with basic information - only tours with upcoming departures."""
-        from datetime import datetime
-        from ..models import TourRepetition
-        
-        # Get current time for filtering
-        now = datetime.utcnow()
-        
-        # Subquery for tours with upcoming materialized departures
-        upcoming_departures_subq = (
-            select(Departure.tour_id)
-            .where(Departure.starts_at >= now)
-            .subquery()
-        )
-        
-        # Subquery for tours with repetitions (virtual departures)
-        virtual_departures_subq = (
-            select(TourRepetition.tour_id)
-            .where(TourRepetition.repeat_time.isnot(None))
-            .subquery()
+        # Tours with upcoming materialized departures or repetitions (virtual departures)
+        rows = await self.tour_repository.search_summaries(
+            upcoming_after=datetime.utcnow(),
+            skip=offset,
+            limit=limit
         )
         
-        # Main query: get tours that have either upcoming departures or repetitions
-        stmt = (
-            select(Tour)
-            .where(
-                or_(
-                    Tour.id.in_(select(upcoming_departures_subq.c.tour_id)),
-                    Tour.id.in_(select(virtual_departures_subq.c.tour_id))
-                )
-            )
-            .order_by(Tour.id.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        tours = await self.session.scalars(stmt)
-        
-        result = []
-        for tour in tours:
-            # Get the standard price from TicketCategory with ticket_class_id=1
-            price = await self.session.scalar(
-                select(TicketCategory.price)
-                .where(TicketCategory.tour_id == tour.id, TicketCategory.ticket_class_id == 1)
-            )
-            result.append({
-                "id": tour.id,
-                "title": tour.title,
-                "price": str(price) if price else None
-            })
-        
-        return result
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "price": str(row.price) if row.price else None
+            }
+            for row in rows
+        ]
+    
     async def get_tour_detail(self, tour_id: int) -> Dict[str, Any]:
         """Get full tour details including images.
         
@@ -672,17 +642,24 @@ class PublicService(BaseService):
         Raises:
             NotFoundError: If tour not found
         """
+        # Standard ticket price comes back with the tour row instead of a separate query
+        standard_price = (
+            select(TicketCategory.price)
+            .where(TicketCategory.tour_id == Tour.id, TicketCategory.ticket_class_id == 1)
+            .limit(1)
+            .scalar_subquery()
+        )
         # Use selectinload to eagerly load the images relationship and categories
-        stmt = select(Tour).options(
+        stmt = select(Tour, standard_price).options(
             selectinload(Tour.images),
             selectinload(Tour.tour_categories)
         ).where(Tour.id == tour_id)
         
-        tour = await self.session.scalar(stmt)
-        tour_standart_price = await self.session.scalar(select(TicketCategory.price).where(TicketCategory.tour_id == tour_id, TicketCategory.ticket_class_id == 1))
+        row = (await self.session.execute(stmt)).first()
         
-        if not tour:
+        if not row:
             raise NotFoundError("Tour not found")
+        tour, tour_standart_price = row
         
         # Get categories from the many-to-many relationship
         categories = []
@@ -760,8 +737,6 @@ class PublicService(BaseService):
             ValidationError: If validation fails
             ConflictError: If not enough seats
         """
-        from ..models import Purchase, PurchaseItem, User
-        from datetime import datetime, timedelta
 
         # Validate inputs
         if not items:
@@ -778,10 +753,26 @@ class PublicService(BaseService):
         except Exception as e:
             raise ValidationError(f"Failed to calculate price quote: {e}")
         
-        # Get the departure
-        departure = await self.session.get(Departure, quote["departure_id"])
+        # Lock the departure row until commit/rollback so concurrent bookings
+        # cannot both pass the seat check; Postgres releases it atomically
+        try:
+            departure = await self.departure_repository.lock_for_update(
+                quote["departure_id"], lock_timeout_ms=BOOKING_LOCK_TIMEOUT_MS
+            )
+        except DBAPIError as e:
+            if getattr(e.orig, "sqlstate", None) == LOCK_NOT_AVAILABLE:
+                raise ConflictError("Departure is busy, please try again")
+            raise
         if not departure:
             raise NotFoundError("Departure not found")
+        
+        taken_stmt = select(func.coalesce(func.sum(Purchase.qty), 0)).where(
+            Purchase.departure_id == departure.id,
+            Purchase.status.notin_(["cancelled", "rejected"])
+        )
+        taken: int = await self.session.scalar(taken_stmt) or 0
+        if quote["total_qty"] > departure.capacity - taken:
+            raise ConflictError("Not enough seats available")
             
         # Get the user
         user = await self.session.get(User, user_id)
@@ -844,7 +835,6 @@ class PublicService(BaseService):
             )
         # Send Telegram confirmation asynchronously
         try:
-            from .notification_service import NotificationService
             notif_svc = NotificationService(self.session)
             await notif_svc.send_booking_confirmation(purchase.id)
         except Exception as exc:
@@ -853,7 +843,6 @@ class PublicService(BaseService):
         
         # Notify admins about the new booking
         try:
-            from .notification_service import NotificationService
             notif_svc = NotificationService(self.session)
             await notif_svc.notify_admins_new_booking(purchase.id)
         except Exception as exc:
@@ -147,7 +147,6 @@ class SupportService(BaseService):
 
             # If this is a payment_request message, also complete the payment request entity
             if message.message_type == "payment_request":
-                from ..models import Landlord, LandlordPaymentRequest
                 # Find landlord linked to this support message
                 landlord = await self.session.scalar(select(Landlord).where(Landlord.user_id == message.user_id))
                 if landlord:
@@ -357,7 +356,7 @@ class SupportService(BaseService):
         """Get payment statistics for a landlord."""
         # Get apartment IDs
         stmt_apartments = select(Apartment.id).where(Apartment.landlord_id == landlord_id)
-        apartment_ids = [row[0] for row in await self.session.execute(stmt_apartments)]
+        apartment_ids = (await self.session.scalars(stmt_apartments)).all()
         
         if not apartment_ids:
             return {
@@ -438,7 +437,6 @@ class SupportService(BaseService):
             
             # For payment requests, we need to add a button to process it
             # Get the latest payment request for this user
-            from ..models import LandlordPaymentRequest, Landlord
             landlord_stmt = select(Landlord).where(Landlord.user_id == user.id)
             landlord = await self.session.scalar(landlord_stmt)
             
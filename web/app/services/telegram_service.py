@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import os
-import httpx
 import logging
 from typing import Optional, Dict, Any
 
+from ..infrastructure.http import get_http_client
+
 
 logger = logging.getLogger(__name__)
 
@@ -51,8 +52,7 @@ class TelegramService:
         if reply_markup:
             payload["reply_markup"] = reply_markup
             
-        async with httpx.AsyncClient() as client:
-            try:
-                await client.post(f"{self._api_base}/sendMessage", json=payload)
-            except Exception as exc:
-                logger.exception("Failed to send Telegram message: %s", exc) 
\ No newline at end of file
+        try:
+            await get_http_client().post(f"{self._api_base}/sendMessage", json=payload)
+        except Exception as exc:
+            logger.exception("Failed to send Telegram message: %s", exc) 
\ No newline at end of file
@@ -13,7 +13,8 @@ from sqlalchemy.sql import exists
 
 from ..core.base import BaseService
 from ..models import (
-    Tour, Departure, TicketCategory, City, TourCategory, TourCategoryAssociation
+    Tour, Departure, TicketCategory, City, TourCategory, TourCategoryAssociation,
+    TourRepetition
 )
 
 # Set up logger
@@ -74,7 +75,6 @@ class TourFilterService(BaseService):
         
         # First, get all tours with recurring patterns for debugging
         if date_from is not None or date_to is not None:
-            from ..models import TourRepetition
             debug_stmt = (
                 select(Tour.id, Tour.title, TourRepetition.repeat_type, TourRepetition.repeat_time)
                 .join(TourRepetition, TourRepetition.tour_id == Tour.id)
@@ -281,7 +281,6 @@ class TourFilterService(BaseService):
             SQLAlchemy query for tour IDs with virtual departures
         """
         # Start with tours that have repetition rows
-        from ..models import TourRepetition
         stmt = select(Tour.id)
         stmt = stmt.join(TourRepetition, TourRepetition.tour_id == Tour.id)
         stmt = stmt.where(TourRepetition.repeat_time.isnot(None))
@@ -396,7 +395,6 @@ class TourFilterService(BaseService):
             logger.debug(f"Matching weekdays for filter: {matching_weekdays}")
             
             # Daily repetition condition - these tours run every day, always include
-            from ..models import TourRepetition
             daily_condition = TourRepetition.repeat_type == REPETITION_DAILY
             logger.debug(f"Looking for daily repetitions with: {REPETITION_DAILY}")
             
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from datetime import datetime, time, timedelta
 from typing import Optional, List, Dict, Any
@@ -7,7 +8,7 @@ import pytz
 from app.core import BaseService, NotFoundError, ValidationError, BusinessLogicError
 from app.infrastructure.repositories import TourRepository
 from app.models import Tour, TourImage, TicketCategory, TicketClass, TourCategory, TourCategoryAssociation, TourRepetition
-from app.storage import upload_image, presigned
+from app.storage import upload_image_async, presigned
 from sqlalchemy import select
 
 
@@ -261,7 +262,8 @@ class TourService(BaseService):
         
         # TODO: Check if tour has departures/bookings before deletion
         
-        return await self.tour_repository.delete(id=tour_id)
+        # Tours cascade to repetitions and category associations on the ORM side
+        return await self.tour_repository.delete(id=tour_id, via_orm=True)
 
     # NEW: repetitions CRUD
     async def list_repetitions(self, tour_id: int, agency_id: int) -> List[TourRepetition]:
@@ -372,6 +374,10 @@ class TourService(BaseService):
             limit=limit
         )
     
+    async def get_agency_tours_brief(self, agency_id: int) -> List[Any]:
+        """Get id/title pairs for an agency's tours"""
+        return await self.tour_repository.get_brief_by_agency(agency_id)
+    
     async def add_tour_images(
         self,
         tour_id: int,
@@ -391,23 +397,27 @@ class TourService(BaseService):
         keys = []
         urls = []
         
-        for file in image_files:
-            # Validate file type
-            if not file.content_type.startswith('image/'):
-                continue
-            
-            try:
-                # Upload image
-                key = upload_image(file)
-                if key:
-                    # Save to database
-                    await self.tour_repository.add_image(tour_id, key)
-                    keys.append(key)
-                    urls.append(presigned(key))
-            except Exception as e:
+        # Validate file type
+        image_files = [f for f in image_files if f.content_type.startswith('image/')]
+        
+        # Each PUT is a blocking round-trip in a worker thread; run them side by side
+        results = await asyncio.gather(
+            *(upload_image_async(file) for file in image_files),
+            return_exceptions=True,
+        )
+        
+        for file, key in zip(image_files, results):
+            if isinstance(key, Exception):
                 # Log error but continue with other images
-                print(f"Error uploading image {file.filename}: {str(e)}")
+                print(f"Error uploading image {file.filename}: {str(key)}")
                 continue
+            if key:
+                keys.append(key)
+                urls.append(presigned(key))
+        
+        # Save to database
+        if keys:
+            await self.tour_repository.add_images(tour_id, keys)
         
         await self.session.commit()
         
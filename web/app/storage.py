@@ -1,5 +1,5 @@
 # web/app/storage.py
-import os, uuid, datetime, pathlib, json
+import os, uuid, datetime, pathlib, json, asyncio, functools, time
 from minio import Minio
 from minio.error import S3Error
 
@@ -31,19 +31,32 @@ if REGION:
 
 client = Minio(ENDPOINT, **client_kwargs)
 
-def upload_image(upload_file):
-    """Upload FastAPI UploadFile → returns object key"""
-    ext = pathlib.Path(upload_file.filename).suffix
-    object_name = f"{uuid.uuid4().hex}{ext}"
-    upload_file.file.seek(0)
+# Objects up to one part go out as a single PUT; larger ones as multipart
+# with parts uploaded in parallel. Small parts hurt throughput, so keep them big.
+PART_SIZE         = 16*1024*1024
+PARALLEL_UPLOADS  = 4
+
+def _put_upload(upload_file, object_name):
+    """PUT an UploadFile's spooled body, sized up front so small files skip multipart"""
+    data = upload_file.file
+    data.seek(0, os.SEEK_END)
+    length = data.tell()
+    data.seek(0)
     client.put_object(
         bucket_name=BUCKET,
         object_name=object_name,
-        data=upload_file.file,
-        length=-1,                      # multipart
-        part_size=10*1024*1024,
+        data=data,
+        length=length,
+        part_size=PART_SIZE,
+        num_parallel_uploads=PARALLEL_UPLOADS,
         content_type=upload_file.content_type
     )
+
+def upload_image(upload_file):
+    """Upload FastAPI UploadFile → returns object key"""
+    ext = pathlib.Path(upload_file.filename).suffix
+    object_name = f"{uuid.uuid4().hex}{ext}"
+    _put_upload(upload_file, object_name)
     return object_name
 
 def upload_qr_template(upload_file):
@@ -51,23 +64,39 @@ def upload_qr_template(upload_file):
     ext = pathlib.Path(upload_file.filename).suffix
     # Use a fixed name for the QR template so we can replace it easily
     object_name = f"qr_template{ext}"
-    upload_file.file.seek(0)
-    client.put_object(
-        bucket_name=BUCKET,
-        object_name=object_name,
-        data=upload_file.file,
-        length=-1,                      # multipart
-        part_size=10*1024*1024,
-        content_type=upload_file.content_type
-    )
+    _put_upload(upload_file, object_name)
     return object_name
 
+@functools.lru_cache(maxsize=4096)
+def _presigned_for_window(object_name, seconds, window):
+    return client.presigned_get_object(
+        BUCKET, object_name,
+        expires=datetime.timedelta(seconds=seconds)
+    )
+
 def presigned(object_name, seconds=3600):
     # For browser access, use the public endpoint
     if PUBLIC_ENDPOINT != ENDPOINT:
         return f"http://{PUBLIC_ENDPOINT}/{BUCKET}/{object_name}"
     else:
-        return client.presigned_get_object(
-            BUCKET, object_name,
-            expires=datetime.timedelta(seconds=seconds)
-        )
+        # Signing is deterministic per window, so reuse a URL for half its
+        # lifetime; anything handed out stays valid for at least seconds/2
+        window = int(time.time() // (seconds / 2))
+        return _presigned_for_window(object_name, seconds, window)
+
+
+# Async wrappers: the minio SDK is blocking, so async code must go through
+# these to keep S3 round-trips off the event loop.
+
+async def bucket_exists():
+    return await asyncio.to_thread(client.bucket_exists, BUCKET)
+
+async def upload_image_async(upload_file):
+    return await asyncio.to_thread(upload_image, upload_file)
+
+async def upload_qr_template_async(upload_file):
+    return await asyncio.to_thread(upload_qr_template, upload_file)
+
+async def fget_object(object_name, file_path):
+    """Download *object_name* from the bucket into *file_path*"""
+    await asyncio.to_thread(client.fget_object, BUCKET, object_name, file_path)